@@ -1,5 +1,6 @@
 """Entry point for TrueFocus Timer application."""
 
+import gc
 import tkinter as tk
 import ctypes
 
@@ -7,6 +8,7 @@ from src.themes import ThemeManager
 from src.config import (
     load_config,
     save_config,
+    STATS_HISTORY_WARMUP_DELAY_MS,
     TIMER_TICK_INTERVAL_MS,
     WINDOW_CHROME_APPLY_DELAY_MS,
 )
@@ -78,8 +80,31 @@ class ChessClock:
         self.root.bind("<Map>", self.mini_window_manager.on_root_map)
         self.root.bind("<Map>", lambda _e: self.root.after(WINDOW_CHROME_APPLY_DELAY_MS, self._apply_window_chrome_theme), add="+")
         self.root.after(WINDOW_CHROME_APPLY_DELAY_MS, self._apply_window_chrome_theme)
+        # Only the current month is loaded at startup; warm older months off the UI thread.
+        self.root.after(
+            STATS_HISTORY_WARMUP_DELAY_MS,
+            lambda: self.stats_tracker.warm_history_async(on_loaded=self._on_history_loaded),
+        )
         self.logger.info("app-started version=%s log=%s", __version__, get_debug_log_path())
 
+    def _on_history_loaded(self):
+        """Finish startup work that needs the full history (runs on the warm-up thread)."""
+        # Read every month's rollup here; the streaks are then built from memory on the Tk
+        # thread, which also updates them as sessions end.
+        self.stats_tracker.preload_rollups()
+        self._freeze_startup_objects()
+        self.root.after(0, self._refresh_streak)
+
+    def _refresh_streak(self):
+        """Redraw the daily goal and streak line in the main window."""
+        self.ui.update_streak_display(self.stats_tracker.get_streak_summary())
+
+    def _freeze_startup_objects(self):
+        """Move startup objects (including the loaded history) out of the cyclic GC's scans."""
+        gc.collect()
+        gc.freeze()
+        self.logger.info("gc-freeze frozen=%d", gc.get_freeze_count())
+
     def _set_window_icon(self, window=None):
         """Set window icon from assets."""
         if window is None:
@@ -118,7 +143,8 @@ class ChessClock:
 
             # NEW: Start tracking session when first player clicks
             if self.stats_tracker.current_session is None:
-                self.stats_tracker.start_session(self.timer_state.player1_time)
+                project, tags = self.ui.get_session_labels()
+                self.stats_tracker.start_session(self.timer_state.player1_time, project=project, tags=tags)
 
             if player == 2 and self.stats_tracker.current_session is not None:
                 self.stats_tracker.current_session["slack_events_count"] += 1
@@ -150,6 +176,7 @@ class ChessClock:
 
         # Display times
         self._display_times()
+        self.stats_tracker.checkpoint(self.timer_state.player2_time)
 
         self.root.after(TIMER_TICK_INTERVAL_MS, self.tick)
 
@@ -204,6 +231,8 @@ class ChessClock:
     def toggle_pause(self):
         """Toggle pause/resume."""
         is_running = self.timer_state.toggle_pause()
+        # Pin the checkpoint to the pause/resume moment so a crash while paused ends there.
+        self.stats_tracker.checkpoint(self.timer_state.player2_time, force=True)
 
         if is_running is not False:
             self.ui.set_pause_button_state(is_running)
@@ -218,6 +247,7 @@ class ChessClock:
         # NEW: Track reset session before resetting
         if self.stats_tracker.current_session is not None:
             self.stats_tracker.reset_session(self.timer_state.player2_time)
+            self._refresh_streak()
 
         self.timer_state.reset()
         self.ui.set_time_selection_enabled(True)
@@ -501,6 +531,7 @@ class ChessClock:
         self.logger.info("window-close")
         self._dismiss_idle_prompt()
         self.idle_detector.stop()
+        self.stats_tracker.close()
         self.mini_window_manager.destroy()
         self.root.destroy()
 
@@ -511,6 +542,7 @@ class ChessClock:
         # NEW: Track completed session
         if self.stats_tracker.current_session is not None:
             self.stats_tracker.end_session(self.timer_state.player2_time, outcome="completed")
+            self._refresh_streak()
         
         self.ui.p1_btn.config(
             text="GAME OVER",
@@ -24,6 +24,34 @@ TIMER_TICK_INTERVAL_MS = 100
 WINDOW_CHROME_APPLY_DELAY_MS = 10
 MINI_WINDOW_SYNC_DELAY_MS = 100
 
+# Stats storage configuration.
+# "journal": append each finished session to YYYY-MM.journal.jsonl and fold it
+#            into YYYY-MM.json on compaction (app close).
+# "json":    rewrite YYYY-MM.json on every finished session (legacy behaviour).
+# "sqlite":  indexed sessions.db (imports existing month files on first use).
+STATS_STORAGE_MODE = "journal"
+# Delay before older months are loaded in the background after the window is drawn.
+STATS_HISTORY_WARMUP_DELAY_MS = 1500
+# Upper bound on threads used to read month files in parallel.
+STATS_LOAD_WORKERS = 4
+# Compress months before the current one into YYYY-MM.json.gz on app close.
+STATS_ARCHIVE_CLOSED_MONTHS = True
+# Write-behind persistence: max sessions waiting on disk, and max queue items per batch.
+STATS_WRITE_QUEUE_SIZE = 64
+STATS_WRITE_BATCH_SIZE = 32
+# Minimum gap between checkpoints of the running session (crash recovery).
+STATS_CHECKPOINT_INTERVAL_SECONDS = 5
+
+# Rows buffered per table before each write when exporting (bounds export memory).
+STATS_EXPORT_CHUNK_ROWS = 10000
+
+# Lock files older than this are treated as left behind by a crashed process
+# (only used where fcntl is unavailable; locks are normally held for milliseconds).
+STATS_LOCK_STALE_SECONDS = 10
+
+# Daily focus goal used for streaks until the user sets one (saved in config.json).
+DEFAULT_DAILY_GOAL_SECONDS = 7200
+
 
 def get_config_path():
     """Get the config file path."""
@@ -52,9 +80,41 @@ def load_config(available_themes):
 
 def save_config(theme):
     """Save theme preference to config file."""
+    _update_config(theme=theme)
+
+
+def load_daily_goal():
+    """Load the daily focus goal in seconds from the config file."""
+    try:
+        config_path = get_config_path()
+        if os.path.exists(config_path):
+            with open(config_path, 'r') as f:
+                goal = json.load(f).get("daily_goal_seconds")
+                if isinstance(goal, int) and goal > 0:
+                    return goal
+    except Exception:
+        from src.debug_log import get_debug_logger
+        get_debug_logger("truefocus.config").exception("config-load-error")
+    return DEFAULT_DAILY_GOAL_SECONDS
+
+
+def save_daily_goal(seconds):
+    """Save the daily focus goal in seconds to the config file."""
+    _update_config(daily_goal_seconds=int(seconds))
+
+
+def _update_config(**values):
+    """Write the given keys to the config file, keeping any other saved settings."""
     try:
         config_path = get_config_path()
-        config = {"theme": theme}
+        config = {}
+        if os.path.exists(config_path):
+            try:
+                with open(config_path, 'r') as f:
+                    config = json.load(f)
+            except ValueError:
+                config = {}
+        config.update(values)
         with open(config_path, 'w') as f:
             json.dump(config, f)
     except Exception:
@@ -1,12 +1,47 @@
 """Session statistics tracking for TrueFocus Timer."""
 
 import os
+import re
+import gzip
 import json
-from datetime import datetime
+import marshal
+import queue
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from src.config import (
+    STATS_ARCHIVE_CLOSED_MONTHS,
+    STATS_CHECKPOINT_INTERVAL_SECONDS,
+    STATS_LOAD_WORKERS,
+    STATS_STORAGE_MODE,
+    STATS_WRITE_BATCH_SIZE,
+    STATS_WRITE_QUEUE_SIZE,
+    load_daily_goal,
+    save_daily_goal,
+)
 from src.debug_log import get_debug_logger
+from src.stats_lock import file_lock
+from src.stats_index import DateIndex, DayRangeTotals, GoalStreaks, TagIndex
+from src.stats_records import SessionRecord, compact_session, json_default
+from src.stats_heatmap import WeekHourHeatmap, add_heat, session_heat_cells
+from src.stats_sketch import DurationSketch
 
 _logger = get_debug_logger("truefocus.stats")
 
+_MONTH_FILE_RE = re.compile(r"^(\d{4})-(\d{2})\.json(\.gz)?$")
+_ARCHIVE_SUFFIX = ".gz"
+_JOURNAL_FILE_RE = re.compile(r"^(\d{4})-(\d{2})\.journal\.jsonl$")
+
+_stats_dir_override = None
+
+
+def set_stats_dir(path):
+    """Point all stats I/O at a different directory (used by the CLI); None restores the default."""
+    global _stats_dir_override
+    _stats_dir_override = os.path.abspath(path) if path else None
+
 
 def get_stats_dir():
     """Get the stats directory path.
@@ -16,7 +51,9 @@ def get_stats_dir():
     """
     import sys
 
-    if getattr(sys, 'frozen', False):
+    if _stats_dir_override is not None:
+        stats_dir = _stats_dir_override
+    elif getattr(sys, 'frozen', False):
         # Running as compiled executable - use user home directory
         stats_dir = os.path.join(os.path.expanduser("~"), ".productivity_clock", "stats")
     else:
@@ -30,35 +67,1075 @@ def get_stats_dir():
 
 
 def get_stats_path_for_month(year, month):
-    """Get the stats file path for a specific month (YYYY-MM.json format)."""
+    """Get the stats file path for a specific month (YYYY-MM.json format).
+
+    Returns the compressed archive (YYYY-MM.json.gz) instead when the month
+    has been archived. This is the file writers update; readers use
+    get_month_file_paths() to also see an archive next to a plain file.
+    """
     filename = f"{year:04d}-{month:02d}.json"
+    path = os.path.join(get_stats_dir(), filename)
+    if not os.path.exists(path) and os.path.exists(path + _ARCHIVE_SUFFIX):
+        return path + _ARCHIVE_SUFFIX
+    return path
+
+
+def get_month_file_paths(year, month):
+    """Return the month files that exist for a month: YYYY-MM.json and/or YYYY-MM.json.gz.
+
+    Both exist when an instance without archiving wrote to a month another
+    instance had archived; readers merge them and archive_month() folds them together.
+    """
+    path = os.path.join(get_stats_dir(), f"{year:04d}-{month:02d}.json")
+    return [p for p in (path, path + _ARCHIVE_SUFFIX) if os.path.exists(p)]
+
+
+def get_journal_path_for_month(year, month):
+    """Get the append-only journal path for a month (YYYY-MM.journal.jsonl format)."""
+    filename = f"{year:04d}-{month:02d}.journal.jsonl"
     return os.path.join(get_stats_dir(), filename)
 
 
-def load_stats():
-    """Load all session statistics from month files."""
+def get_lock_path_for_month(year, month):
+    """Get the advisory lock file guarding a month's files (YYYY-MM.lock format)."""
+    return os.path.join(get_stats_dir(), f"{year:04d}-{month:02d}.lock")
+
+
+def month_lock(year, month):
+    """Return a context manager holding the month's cross-process write lock."""
+    return file_lock(get_lock_path_for_month(year, month))
+
+
+def file_stamp(path):
+    """Return (inode, size, mtime) identifying a file's current version, or None if it is missing."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_ino, st.st_size, st.st_mtime_ns
+
+
+def is_stats_filename(filename):
+    """Return True for month files (plain or archived) and month journals."""
+    return bool(_MONTH_FILE_RE.match(filename) or _JOURNAL_FILE_RE.match(filename))
+
+
+def list_stats_months():
+    """Return sorted (year, month) pairs that have a month file or a journal."""
+    months = set()
     stats_dir = get_stats_dir()
+    if os.path.exists(stats_dir):
+        for filename in os.listdir(stats_dir):
+            match = _MONTH_FILE_RE.match(filename) or _JOURNAL_FILE_RE.match(filename)
+            if match:
+                months.add((int(match.group(1)), int(match.group(2))))
+    return sorted(months)
+
+
+def _session_key(session):
+    """Return the identity of a session (its start timestamp)."""
+    return session.get("start_time")
+
+
+def merge_sessions(base, extra):
+    """Append sessions from extra to base, skipping ones already present by start time."""
+    seen = {_session_key(s) for s in base}
+    for session in extra:
+        key = _session_key(session)
+        if key is not None and key in seen:
+            continue
+        seen.add(key)
+        base.append(session)
+    return base
+
+
+def read_month_file(path):
+    """Read a month file's JSON, transparently decompressing .json.gz archives."""
+    if path.endswith(_ARCHIVE_SUFFIX):
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            return json.load(f)
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def _load_month_file(path):
+    """Load the sessions list from a single month JSON file."""
+    data = read_month_file(path)
+    if isinstance(data, dict) and isinstance(data.get("sessions"), list):
+        return data["sessions"]
+    return []
+
+
+_STREAM_CHUNK_SIZE = 64 * 1024
+_JSON_WS = " \t\r\n"
+
+
+def _open_month_text(path):
+    """Open a month file (plain or .json.gz) for text reading."""
+    if path.endswith(_ARCHIVE_SUFFIX):
+        return gzip.open(path, 'rt', encoding='utf-8')
+    return open(path, 'r', encoding='utf-8')
+
+
+def iter_month_file(path, chunk_size=_STREAM_CHUNK_SIZE):
+    """Yield sessions from a month file's top-level "sessions" array one at a time.
+
+    The file is read in chunks and each array element is decoded with
+    JSONDecoder.raw_decode as soon as it is complete, so memory stays
+    bounded by the largest single session rather than the file size.
+    Top-level keys before "sessions" are decoded and skipped, so a nested
+    "sessions" key elsewhere in the file is never mistaken for it.
+    """
+    decoder = json.JSONDecoder()
+    with _open_month_text(path) as f:
+        buf = ""
+        pos = 0
+        eof = False
+
+        def fill():
+            nonlocal buf, pos, eof
+            buf = buf[pos:]
+            pos = 0
+            chunk = f.read(chunk_size)
+            if chunk:
+                buf += chunk
+            else:
+                eof = True
+
+        def peek(skip_chars):
+            """Advance past skip_chars and return the next character (None at EOF)."""
+            nonlocal pos
+            while True:
+                while pos < len(buf) and buf[pos] in skip_chars:
+                    pos += 1
+                if pos < len(buf):
+                    return buf[pos]
+                if eof:
+                    return None
+                fill()
+
+        def decode():
+            """Decode the JSON value at pos, pulling in more text until it is complete."""
+            nonlocal pos
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buf, pos)
+                except ValueError:
+                    if eof:
+                        raise
+                    fill()
+                    continue
+                if end == len(buf) and not eof:
+                    # A number may continue in the next chunk.
+                    fill()
+                    continue
+                pos = end
+                return value
+
+        # Walk the top-level object's keys up to "sessions".
+        if peek(_JSON_WS) != "{":
+            return
+        pos += 1
+        while True:
+            if peek(_JSON_WS + ",") != '"':
+                return
+            key = decode()
+            if peek(_JSON_WS) != ":":
+                raise ValueError(f"malformed month file {path}")
+            pos += 1
+            if peek(_JSON_WS) == "[" and key == "sessions":
+                pos += 1
+                break
+            decode()
+
+        while True:
+            char = peek(_JSON_WS + ",")
+            if char is None:
+                raise ValueError(f"unterminated sessions array in {path}")
+            if char == "]":
+                return
+            item = decode()
+            if isinstance(item, dict):
+                yield item
+
+
+def iter_journal(path):
+    """Yield sessions from a journal file one line at a time.
+
+    A torn trailing line (e.g. after a crash mid-append) is logged and skipped.
+    """
+    if not os.path.exists(path):
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_no, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                session = json.loads(line)
+            except ValueError:
+                _logger.warning("journal-line-skipped path=%s line=%d", path, line_no)
+                continue
+            if isinstance(session, dict):
+                yield session
+
+
+def load_journal(path):
+    """Load sessions from a journal file."""
+    return list(iter_journal(path))
+
+
+def append_journal(sessions, year, month):
+    """Append finished sessions (a dict or a list of dicts) to the month journal and fsync it."""
+    if isinstance(sessions, (dict, SessionRecord)):
+        sessions = [sessions]
+    journal_path = get_journal_path_for_month(year, month)
+    lines = "".join(
+        json.dumps(session, separators=(",", ":"), default=json_default) + "\n" for session in sessions
+    )
+    # The lock keeps the append from landing between a compactor's read and its removal of the journal.
+    with month_lock(year, month):
+        with open(journal_path, 'a', encoding='utf-8') as f:
+            f.write(lines)
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def load_month_sessions(year, month):
+    """Load one month's sessions, merging the month file with its journal."""
+    sessions = []
+    for month_path in get_month_file_paths(year, month):
+        try:
+            merge_sessions(sessions, _load_month_file(month_path))
+        except Exception:
+            _logger.exception("stats-file-load-error file=%s", os.path.basename(month_path))
+    journal_path = get_journal_path_for_month(year, month)
+    if os.path.exists(journal_path):
+        try:
+            merge_sessions(sessions, load_journal(journal_path))
+        except Exception:
+            _logger.exception("stats-file-load-error file=%s", os.path.basename(journal_path))
+    return sessions
+
+
+def iter_month_sessions(year, month):
+    """Stream one month's sessions: the month file(s) first, then journal entries not already seen."""
+    seen = set()
+    for month_path in get_month_file_paths(year, month):
+        try:
+            for session in iter_month_file(month_path):
+                key = _session_key(session)
+                if key is not None and key in seen:
+                    continue
+                seen.add(key)
+                yield session
+        except Exception:
+            _logger.exception("stats-file-stream-error file=%s", os.path.basename(month_path))
+    journal_path = get_journal_path_for_month(year, month)
+    if os.path.exists(journal_path):
+        for session in iter_journal(journal_path):
+            key = _session_key(session)
+            if key is not None and key in seen:
+                continue
+            seen.add(key)
+            yield session
+
+
+def iter_stored_sessions(start=None, end=None):
+    """Stream stored sessions whose start time falls in [start, end), month by month.
+
+    start/end are datetimes (or None for unbounded); only month files that
+    overlap the range are opened.
+    """
+    start_key = start.isoformat() if start else None
+    end_key = end.isoformat() if end else None
+    first = (start.year, start.month) if start else None
+    last = (end.year, end.month) if end else None
+    for year_month in list_stats_months():
+        if (first and year_month < first) or (last and year_month > last):
+            continue
+        for session in iter_month_sessions(*year_month):
+            key = session.get("start_time")
+            if not key:
+                continue
+            if (start_key and key < start_key) or (end_key and key >= end_key):
+                continue
+            yield session
+
+
+def _load_month_timed(year_month):
+    """Load one month's sessions and log how long it took."""
+    year, month = year_month
+    start = time.perf_counter()
+    sessions = load_month_sessions(year, month)
+    _logger.info(
+        "stats-month-loaded month=%04d-%02d sessions=%d elapsed=%.3fs",
+        year, month, len(sessions), time.perf_counter() - start,
+    )
+    return sessions
+
+
+_SNAPSHOT_FILENAME = "sessions.snapshot"
+_SNAPSHOT_VERSION = 1
+
+
+def get_snapshot_path():
+    """Get the startup snapshot cache path inside the stats directory."""
+    return os.path.join(get_stats_dir(), _SNAPSHOT_FILENAME)
+
+
+def _load_snapshot():
+    """Load the snapshot cache as {(year, month): (signature, sessions)}.
+
+    Any unreadable, corrupt or foreign-version snapshot yields an empty cache,
+    and badly shaped entries are dropped so their months are parsed again.
+    """
+    path = get_snapshot_path()
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'rb') as f:
+            # One bulk read; marshal.load() on a file object reads item by item.
+            data = marshal.loads(f.read())
+        if not isinstance(data, dict) or data.get("version") != _SNAPSHOT_VERSION:
+            return {}
+        months = data["months"]
+        if not isinstance(months, dict):
+            return {}
+        return {
+            ym: entry for ym, entry in months.items()
+            if isinstance(entry, tuple) and len(entry) == 2
+            and isinstance(entry[0], list) and isinstance(entry[1], list)
+            and all(isinstance(session, dict) for session in entry[1])
+        }
+    except Exception:
+        _logger.warning("stats-snapshot-unusable path=%s", path)
+        return {}
+
+
+def _save_snapshot(months):
+    """Write the snapshot cache atomically."""
+    path = get_snapshot_path()
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(marshal.dumps({"version": _SNAPSHOT_VERSION, "months": months}))
+        os.replace(tmp_path, path)
+    except Exception:
+        _logger.exception("stats-snapshot-save-error path=%s", path)
+
+
+def _load_months(months, max_workers):
+    """Parse the given months (bounded thread pool) and return their session lists in order."""
+    if max_workers > 1 and len(months) > 1:
+        with ThreadPoolExecutor(
+            max_workers=min(max_workers, len(months)),
+            thread_name_prefix="stats-load",
+        ) as pool:
+            # map() yields results in submission order, i.e. chronologically.
+            return list(pool.map(_load_month_timed, months))
+    return [_load_month_timed(year_month) for year_month in months]
+
+
+def load_stats(max_workers=STATS_LOAD_WORKERS, use_snapshot=True):
+    """Load all session statistics from month files and their journals.
+
+    Months whose files are unchanged (same name, size and mtime) since the
+    last run come from the snapshot cache in a single read; the rest are read
+    and parsed on a bounded thread pool (file reads release the GIL, which
+    matters on slow or roaming-profile drives). Results are merged in
+    chronological order.
+
+    The current month is left out of the snapshot: its journal changes on
+    every run, so caching it would rewrite the whole snapshot at each launch.
+    """
     all_sessions = []
 
     try:
-        # Look for all YYYY-MM.json files in the stats directory
-        if os.path.exists(stats_dir):
-            for filename in sorted(os.listdir(stats_dir)):
-                if filename.endswith('.json'):
-                    filepath = os.path.join(stats_dir, filename)
-                    try:
-                        with open(filepath, 'r') as f:
-                            data = json.load(f)
-                            if isinstance(data, dict) and "sessions" in data:
-                                all_sessions.extend(data["sessions"])
-                    except Exception:
-                        _logger.exception("stats-file-load-error file=%s", filename)
+        months = list_stats_months()
+        start = time.perf_counter()
+        now = datetime.now()
+        current = (now.year, now.month)
+        cached = _load_snapshot() if use_snapshot else {}
+        signatures = {ym: month_file_signature(*ym) for ym in months}
+        stale = [ym for ym in months if ym not in cached or cached[ym][0] != signatures[ym]]
+        parsed = dict(zip(stale, _load_months(stale, max_workers)))
+
+        snapshot = {}
+        for ym in months:
+            sessions = parsed[ym] if ym in parsed else cached[ym][1]
+            if ym != current:
+                snapshot[ym] = (signatures[ym], sessions)
+            all_sessions.extend(sessions)
+        if use_snapshot and (any(ym in parsed for ym in snapshot) or snapshot.keys() != cached.keys()):
+            _save_snapshot(snapshot)
+        _logger.info(
+            "stats-load-done months=%d parsed=%d sessions=%d elapsed=%.3fs",
+            len(months), len(stale), len(all_sessions), time.perf_counter() - start,
+        )
     except Exception:
         _logger.exception("stats-load-error")
 
     return {"sessions": all_sessions}
 
 
+_CHECKPOINT_RE = re.compile(r"^checkpoint-(.+)-(\d+)\.jsonl$")
+
+
+def get_checkpoint_path(pid=None):
+    """Get this process's in-progress session checkpoint log path.
+
+    The host name and PID are part of the file name so several instances
+    (or machines syncing one folder) never recover each other's live sessions.
+    """
+    filename = f"checkpoint-{socket.gethostname()}-{pid or os.getpid()}.jsonl"
+    return os.path.join(get_stats_dir(), filename)
+
+
+def append_checkpoint(record):
+    """Append one delta record to this process's checkpoint log and fsync it."""
+    with open(get_checkpoint_path(), 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record, separators=(",", ":")) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def clear_checkpoint(path=None):
+    """Delete a checkpoint log once its session is safely stored."""
+    try:
+        os.remove(path or get_checkpoint_path())
+    except FileNotFoundError:
+        pass
+
+
+def _process_alive(pid):
+    """Return True if a process with this PID is running on this machine."""
+    if pid == os.getpid():
+        return True
+    if os.name == "nt":
+        import ctypes
+
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return False
+        try:
+            exit_code = ctypes.c_ulong()
+            kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code))
+            return exit_code.value == 259  # STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(handle)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def find_orphaned_checkpoints():
+    """Return checkpoint logs on this host whose owning process is gone."""
+    host = socket.gethostname()
+    orphans = []
+    stats_dir = get_stats_dir()
+    for filename in sorted(os.listdir(stats_dir)):
+        match = _CHECKPOINT_RE.match(filename)
+        if match and match.group(1) == host and not _process_alive(int(match.group(2))):
+            orphans.append(os.path.join(stats_dir, filename))
+    return orphans
+
+
+def replay_checkpoint(path):
+    """Rebuild the session recorded in a checkpoint log, closed at its last checkpoint.
+
+    Returns None if the log never recorded a session start.
+    """
+    session = None
+    slack_start = None
+    last_seen = None
+    for record in iter_journal(path):
+        op = record.get("op")
+        if op == "start":
+            session = dict(record["session"], slack_segments=[])
+            slack_start = None
+            last_seen = session["start_time"]
+        elif session is None:
+            continue
+        elif op == "slack_start":
+            slack_start = record["at"]
+            last_seen = max(last_seen, slack_start)
+        elif op == "segment":
+            session["slack_segments"].append(record["segment"])
+            slack_start = None
+            last_seen = max(last_seen, record["segment"]["end_time"])
+        elif op == "tick":
+            session["total_slack_time"] = record["slack"]
+            session["slack_events_count"] = record["events"]
+            last_seen = max(last_seen, record["at"])
+    if session is None:
+        return None
+
+    if slack_start is not None:
+        duration = (datetime.fromisoformat(last_seen) - datetime.fromisoformat(slack_start)).total_seconds()
+        session["slack_segments"].append({
+            "start_time": slack_start,
+            "end_time": last_seen,
+            "duration_seconds": max(int(duration), 0),
+        })
+    session["end_time"] = last_seen
+    add_session_timestamps(session)
+    total_slack = int(session.get("total_slack_time", 0))
+    session["total_slack_time"] = total_slack
+    session["work_time_actual"] = max(int(session.get("initial_productivity_time", 0)) - total_slack, 0)
+    session["outcome"] = "interrupted"
+    return session
+
+
+def _write_json_atomic(path, data):
+    """Write JSON to path via a temp file and rename so readers never see a partial file.
+
+    Paths ending in .gz are written as compact gzip-compressed JSON.
+    """
+    os.replace(_write_json_temp(path, data), path)
+
+
+def _write_json_temp(path, data):
+    """Write JSON for path into a per-process temp file beside it and return the temp path."""
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    if path.endswith(_ARCHIVE_SUFFIX):
+        with open(tmp_path, 'wb') as raw:
+            with gzip.GzipFile(fileobj=raw, mode='wb', mtime=0) as f:
+                f.write(json.dumps(data, separators=(",", ":"), default=json_default).encode('utf-8'))
+            raw.flush()
+            os.fsync(raw.fileno())
+    else:
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, indent=2, default=json_default)
+            f.flush()
+            os.fsync(f.fileno())
+    return tmp_path
+
+
+def _swap_in_month_file(year, month, path, build, source_paths=None, after_swap=None):
+    """Atomically replace path with build(), merging with writers in other processes.
+
+    build() reads what it needs and returns the new data; it runs unlocked.
+    Under the month lock the prepared file is only swapped in if every file
+    in source_paths (default: path) is unchanged; otherwise build() runs again
+    against the other writer's version. after_swap() runs under the same lock.
+    In the common case the lock is held for a few stats and a rename.
+    """
+    source_paths = source_paths or (path,)
+    stamp = [file_stamp(source) for source in source_paths]
+    tmp_path = _write_json_temp(path, build())
+    try:
+        with month_lock(year, month):
+            if [file_stamp(source) for source in source_paths] != stamp:
+                _logger.info("month-write-merged path=%s", os.path.basename(path))
+                os.remove(tmp_path)
+                tmp_path = _write_json_temp(path, build())
+            os.replace(tmp_path, path)
+            if after_swap is not None:
+                after_swap()
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+# Version 2 added integer epoch timestamps (start_ts/end_ts, plus the local
+# utc_offset in seconds) alongside the ISO strings of sessions and segments.
+SCHEMA_VERSION = 2
+_SCHEMA_VERSION_RE = re.compile(r'"schema_version"\s*:\s*(\d+)')
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def local_epoch(dt):
+    """Return (epoch seconds, UTC offset seconds) for a naive local or aware datetime."""
+    aware = dt.astimezone() if dt.tzinfo is None else dt
+    return int(aware.timestamp()), int(aware.utcoffset().total_seconds())
+
+
+def iso_epoch(value):
+    """Return local_epoch() of an ISO timestamp string, or (None, None) if unparseable."""
+    if not value:
+        return None, None
+    try:
+        return local_epoch(datetime.fromisoformat(value))
+    except (TypeError, ValueError):
+        return None, None
+
+
+def add_session_timestamps(session):
+    """Fill in missing epoch fields of a session dict (and its segments) from the ISO strings.
+
+    Returns the session; compact records are returned unchanged.
+    """
+    if not isinstance(session, dict):
+        return session
+    if "start_ts" not in session:
+        session["start_ts"], session["utc_offset"] = iso_epoch(session.get("start_time"))
+    if session.get("end_ts") is None:
+        session["end_ts"] = iso_epoch(session.get("end_time"))[0]
+    for seg in session.get("slack_segments", []):
+        if isinstance(seg, dict) and "start_ts" not in seg:
+            seg["start_ts"] = iso_epoch(seg.get("start_time"))[0]
+            seg["end_ts"] = iso_epoch(seg.get("end_time"))[0]
+    return session
+
+
+def session_day_ordinal(session):
+    """Return the proleptic ordinal of the local day a session started on (None if unknown)."""
+    start_ts = session.get("start_ts")
+    if start_ts is not None:
+        return (start_ts + (session.get("utc_offset") or 0)) // 86400 + _EPOCH_ORDINAL
+    start_ts, offset = iso_epoch(session.get("start_time"))
+    if start_ts is None:
+        return None
+    return (start_ts + offset) // 86400 + _EPOCH_ORDINAL
+
+
+def session_clock_label(session):
+    """Return the local HH:MM a session started at, or "--:--"."""
+    start_ts = session.get("start_ts")
+    offset = session.get("utc_offset") or 0
+    if start_ts is None:
+        start_ts, offset = iso_epoch(session.get("start_time"))
+        if start_ts is None:
+            return "--:--"
+    minutes = (start_ts + offset) // 60
+    return f"{minutes // 60 % 24:02d}:{minutes % 60:02d}"
+
+
+def _session_record(session):
+    """Return the compact in-memory record for a stored session."""
+    return compact_session(add_session_timestamps(session))
+
+
+def compute_session_metrics(session):
+    """Compute derived metrics for a session."""
+    start_time = session.get("start_time")
+    end_time = session.get("end_time")
+    initial_time = session.get("initial_productivity_time", 0)
+    total_slack = session.get("total_slack_time", 0)
+
+    wall_clock_duration = 0
+    start_ts = session.get("start_ts")
+    end_ts = session.get("end_ts")
+    if start_ts is not None and end_ts is not None:
+        wall_clock_duration = max(end_ts - start_ts, 0)
+    elif start_time and end_time:
+        try:
+            start_dt = datetime.fromisoformat(start_time)
+            end_dt = datetime.fromisoformat(end_time)
+            wall_clock_duration = max(int((end_dt - start_dt).total_seconds()), 0)
+        except ValueError:
+            wall_clock_duration = 0
+
+    if session.get("outcome") == "completed":
+        actual_focus_time = int(initial_time)
+    elif wall_clock_duration or session.get("outcome") == "interrupted":
+        # Recovered sessions end at their last checkpoint, so no elapsed time means no focus.
+        actual_focus_time = max(int(wall_clock_duration - total_slack), 0)
+    else:
+        actual_focus_time = max(int(initial_time - total_slack), 0)
+    slack_ratio = (total_slack / (actual_focus_time + total_slack)) if (actual_focus_time + total_slack) else 0
+    overrun_time = wall_clock_duration - initial_time
+
+    return {
+        "wall_clock_duration": wall_clock_duration,
+        "actual_focus_time": actual_focus_time,
+        "slack_ratio": slack_ratio,
+        "overrun_time": overrun_time
+    }
+
+
+# Version 2 added the per-day "interruptions" duration sketch, version 3 the "heatmap"
+# cells, version 4 the "projects"/"tags" session postings, version 5 the counted
+# session "ids" and version 6 no focus for recovered sessions that had no elapsed time.
+_ROLLUP_VERSION = 6
+
+
+def get_rollup_path_for_month(year, month):
+    """Get the per-day rollup path for a month (YYYY-MM.rollup.json format)."""
+    filename = f"{year:04d}-{month:02d}.rollup.json"
+    return os.path.join(get_stats_dir(), filename)
+
+
+def month_file_signature(year, month):
+    """Return (name, size, mtime_ns) for a month's source files, used to detect stale rollups."""
+    signature = []
+    for path in get_month_file_paths(year, month) + [get_journal_path_for_month(year, month)]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        signature.append([os.path.basename(path), st.st_size, st.st_mtime_ns])
+    return signature
+
+
+def empty_day_rollup():
+    """Return a zeroed per-day rollup entry."""
+    return {
+        "sessions": 0,
+        "planned": 0,
+        "actual": 0,
+        "slack": 0,
+        "slack_events": 0,
+        "longest_interruption": None,
+        "interruptions": DurationSketch(),
+        "heatmap": {},
+        # {name: {session start_time: [actual, slack]}}, the persisted side of TagIndex.
+        "projects": {},
+        "tags": {},
+        # start_time of every session counted, so sessions stored by other instances can be told apart.
+        "ids": [],
+    }
+
+
+# Rollup fields that add up across sessions and days (longest_interruption does not).
+ROLLUP_SUM_FIELDS = ("sessions", "planned", "actual", "slack", "slack_events")
+_ACTUAL = ROLLUP_SUM_FIELDS.index("actual")
+_SLACK = ROLLUP_SUM_FIELDS.index("slack")
+
+
+def session_rollup_values(session):
+    """Return what one session adds to each of ROLLUP_SUM_FIELDS."""
+    return (
+        1,
+        session.get("initial_productivity_time", 0),
+        compute_session_metrics(session)["actual_focus_time"],
+        session.get("total_slack_time", 0),
+        session.get("slack_events_count", 0),
+    )
+
+
+def add_interruption_to_rollup(day, duration):
+    """Fold one slack segment's duration into a per-day rollup entry."""
+    if day["longest_interruption"] is None or duration > day["longest_interruption"]:
+        day["longest_interruption"] = duration
+    day["interruptions"].add(duration)
+
+
+def add_session_to_rollup(days, session, include_segments=True):
+    """Fold one session into a {YYYY-MM-DD: rollup} mapping.
+
+    include_segments=False skips the slack segments, for sessions whose
+    segments were already folded in as they ended.
+    """
+    start_time = session.get("start_time")
+    if not start_time:
+        return
+    day = days.setdefault(start_time[:10], empty_day_rollup())
+    values = session_rollup_values(session)
+    for field, value in zip(ROLLUP_SUM_FIELDS, values):
+        day[field] += value
+    day["ids"].append(start_time)
+    add_heat(day["heatmap"], session_heat_cells(session))
+    posting = [values[_ACTUAL], values[_SLACK]]
+    project = session.get("project")
+    if project:
+        day["projects"].setdefault(project, {})[start_time] = posting
+    for tag in session.get("tags") or ():
+        day["tags"].setdefault(tag, {})[start_time] = posting
+    if not include_segments:
+        return
+    for seg in session.get("slack_segments", []):
+        duration = seg.get("duration_seconds")
+        if duration is not None:
+            add_interruption_to_rollup(day, duration)
+
+
+def build_month_rollup(sessions):
+    """Build the per-day rollup mapping from a month's sessions in one pass."""
+    days = {}
+    for session in sessions:
+        add_session_to_rollup(days, session)
+    return days
+
+
+def copy_month_rollup(days):
+    """Return a copy of a {YYYY-MM-DD: rollup} mapping that shares no mutable state with it."""
+    return {
+        key: dict(
+            rollup,
+            interruptions=rollup["interruptions"].copy(),
+            heatmap={cell: list(values) for cell, values in rollup["heatmap"].items()},
+            projects={name: dict(postings) for name, postings in rollup["projects"].items()},
+            tags={name: dict(postings) for name, postings in rollup["tags"].items()},
+            ids=list(rollup["ids"]),
+        )
+        for key, rollup in days.items()
+    }
+
+
+def combine_rollups(rollups):
+    """Sum per-day rollups into one rollup (longest interruption is the maximum)."""
+    total = empty_day_rollup()
+    for rollup in rollups:
+        for field in ROLLUP_SUM_FIELDS:
+            total[field] += rollup[field]
+        longest = rollup["longest_interruption"]
+        if longest is not None and (total["longest_interruption"] is None or longest > total["longest_interruption"]):
+            total["longest_interruption"] = longest
+        total["interruptions"].merge(rollup.get("interruptions"))
+        add_heat(total["heatmap"], rollup.get("heatmap", {}))
+        for kind in ("projects", "tags"):
+            for name, postings in rollup.get(kind, {}).items():
+                total[kind].setdefault(name, {}).update(postings)
+    return total
+
+
+def calculate_efficiency(slack_ratio):
+    """Compute focus efficiency from slack ratio."""
+    return max(0, 1 - slack_ratio)
+
+
+def summarize_rollup(rollup):
+    """Return the dashboard's headline and insight figures for a rollup."""
+    actual = rollup["actual"]
+    slack = rollup["slack"]
+    slack_ratio = (slack / (actual + slack)) if (actual + slack) else 0
+    sessions = rollup["sessions"]
+    sketch = rollup.get("interruptions")
+    return {
+        "sessions": sessions,
+        "planned": rollup["planned"],
+        "actual": actual,
+        "slack": slack,
+        "slack_ratio": slack_ratio,
+        "efficiency": calculate_efficiency(slack_ratio),
+        "avg_slack": (slack / sessions) if sessions else 0,
+        "longest_interruption": rollup["longest_interruption"],
+        "interruptions": sketch.summary() if sketch is not None else None,
+    }
+
+
+def find_most_disrupted(sessions):
+    """Return (session, slack_ratio) for the highest slack ratio among sessions with metrics."""
+    most_disrupted = None
+    max_ratio = -1
+    for session in sessions:
+        ratio = session.get("slack_ratio", 0)
+        if ratio > max_ratio:
+            max_ratio = ratio
+            most_disrupted = session
+    return most_disrupted, max_ratio
+
+
+def load_month_rollup(year, month, signature):
+    """Load a month's per-day rollup; return None if missing, corrupt or stale."""
+    path = get_rollup_path_for_month(year, month)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+    except Exception:
+        _logger.exception("rollup-load-error year=%s month=%s", year, month)
+        return None
+    if data.get("version") != _ROLLUP_VERSION or data.get("source") != signature:
+        return None
+    days = data.get("days", {})
+    for rollup in days.values():
+        rollup["interruptions"] = DurationSketch.from_dict(rollup.get("interruptions"))
+    return days
+
+
+def save_month_rollup(year, month, days, signature):
+    """Save a month's per-day rollup with the source signature it was built from."""
+    days = {key: dict(rollup, interruptions=rollup["interruptions"].to_dict()) for key, rollup in days.items()}
+    try:
+        _write_json_atomic(
+            get_rollup_path_for_month(year, month),
+            {"version": _ROLLUP_VERSION, "source": signature, "days": days},
+        )
+    except Exception:
+        _logger.exception("rollup-save-error year=%s month=%s", year, month)
+
+
+def _refresh_rollup_source(year, month, old_signature):
+    """Re-stamp a fresh rollup after its source files were rewritten without content changes."""
+    days = load_month_rollup(year, month, old_signature)
+    if days is not None:
+        save_month_rollup(year, month, days, month_file_signature(year, month))
+
+
+def compact_journal(year, month):
+    """Fold a month's journal into its month file and remove the journal."""
+    journal_path = get_journal_path_for_month(year, month)
+    if not os.path.exists(journal_path):
+        return False
+    try:
+        old_signature = month_file_signature(year, month)
+        _rewrite_month_file([], year, month, fold_journal=True)
+        _refresh_rollup_source(year, month, old_signature)
+        return True
+    except Exception:
+        _logger.exception("journal-compact-error year=%s month=%s", year, month)
+        return False
+
+
+def compact_journals():
+    """Compact every month journal in the stats directory."""
+    compacted = 0
+    stats_dir = get_stats_dir()
+    for filename in sorted(os.listdir(stats_dir)):
+        match = _JOURNAL_FILE_RE.match(filename)
+        if match and compact_journal(int(match.group(1)), int(match.group(2))):
+            compacted += 1
+    if compacted:
+        _logger.info("journals-compacted count=%d", compacted)
+    return compacted
+
+
+def _merged_month_data(paths):
+    """Read and upgrade month files, merging the sessions of later paths into the first by start time."""
+    data = upgrade_month_data(read_month_file(paths[0]))
+    if len(paths) > 1:
+        for path in paths[1:]:
+            merge_sessions(data["sessions"], _load_month_file(path))
+        data["sessions"].sort(key=_sort_key)
+    return data
+
+
+def archive_month(year, month):
+    """Compress a month file into YYYY-MM.json.gz (folding its journal in first).
+
+    An existing archive is merged with the month file rather than overwritten.
+    """
+    compact_journal(year, month)
+    plain_path = os.path.join(get_stats_dir(), f"{year:04d}-{month:02d}.json")
+    archive_path = plain_path + _ARCHIVE_SUFFIX
+    if not os.path.exists(plain_path):
+        return False
+    try:
+        old_signature = month_file_signature(year, month)
+        _swap_in_month_file(
+            year, month, archive_path,
+            lambda: _merged_month_data([p for p in (plain_path, archive_path) if os.path.exists(p)]),
+            source_paths=(plain_path, archive_path),
+            after_swap=lambda: os.remove(plain_path),
+        )
+        _refresh_rollup_source(year, month, old_signature)
+        return True
+    except Exception:
+        _logger.exception("month-archive-error year=%s month=%s", year, month)
+        return False
+
+
+def unarchive_month(year, month):
+    """Expand YYYY-MM.json.gz back into a pretty-printed YYYY-MM.json.
+
+    An existing YYYY-MM.json is merged with the archive rather than kept as-is.
+    """
+    plain_path = os.path.join(get_stats_dir(), f"{year:04d}-{month:02d}.json")
+    archive_path = plain_path + _ARCHIVE_SUFFIX
+    if not os.path.exists(archive_path):
+        return False
+    try:
+        old_signature = month_file_signature(year, month)
+        _swap_in_month_file(
+            year, month, plain_path,
+            lambda: _merged_month_data([p for p in (archive_path, plain_path) if os.path.exists(p)]),
+            source_paths=(archive_path, plain_path),
+            after_swap=lambda: os.remove(archive_path),
+        )
+        _refresh_rollup_source(year, month, old_signature)
+        return True
+    except Exception:
+        _logger.exception("month-unarchive-error year=%s month=%s", year, month)
+        return False
+
+
+_KEEP_PLAIN_FILENAME = "archive.off"
+
+
+def get_keep_plain_path():
+    """Get the marker file that stops closed months being archived on app close."""
+    return os.path.join(get_stats_dir(), _KEEP_PLAIN_FILENAME)
+
+
+def auto_archive_enabled():
+    """Return True if closed months should be archived when the app closes."""
+    return STATS_ARCHIVE_CLOSED_MONTHS and not os.path.exists(get_keep_plain_path())
+
+
+def set_auto_archive(enabled):
+    """Turn archiving on app close on or off for this stats directory (via the marker file)."""
+    path = get_keep_plain_path()
+    if enabled:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("Closed months stay plain JSON; run `python -m src.stats archive` to archive again.\n")
+
+
+def archive_closed_months():
+    """Archive every month before the current one; return how many were archived."""
+    now = datetime.now()
+    archived = sum(
+        1 for year, month in list_stats_months()
+        if (year, month) < (now.year, now.month) and archive_month(year, month)
+    )
+    if archived:
+        _logger.info("months-archived count=%d", archived)
+    return archived
+
+
+def unarchive_all_months():
+    """Unarchive every archived month; return how many were expanded."""
+    return sum(1 for year, month in list_stats_months() if unarchive_month(year, month))
+
+
+def upgrade_month_data(data):
+    """Return month file data upgraded to the current schema, with schema_version first."""
+    if not isinstance(data, dict) or not isinstance(data.get("sessions"), list):
+        data = {"sessions": []}
+    for session in data["sessions"]:
+        add_session_timestamps(session)
+    upgraded = {"schema_version": SCHEMA_VERSION}
+    upgraded.update((key, value) for key, value in data.items() if key != "schema_version")
+    return upgraded
+
+
+def month_file_schema_version(path):
+    """Peek at a month file's schema_version without parsing it (0 for pre-versioned files)."""
+    with _open_month_text(path) as f:
+        head = f.read(128)
+    match = _SCHEMA_VERSION_RE.search(head)
+    return int(match.group(1)) if match else 0
+
+
+def migrate_month(year, month):
+    """Upgrade one month file to the current schema in place; return True if it was rewritten."""
+    path = get_stats_path_for_month(year, month)
+    if not os.path.exists(path):
+        return False
+    try:
+        if month_file_schema_version(path) >= SCHEMA_VERSION:
+            return False
+        old_signature = month_file_signature(year, month)
+        _swap_in_month_file(year, month, path, lambda: upgrade_month_data(read_month_file(path)))
+        _refresh_rollup_source(year, month, old_signature)
+        return True
+    except Exception:
+        _logger.exception("month-migrate-error year=%s month=%s", year, month)
+        return False
+
+
+def migrate_stats_files():
+    """Fold journals and upgrade every month file to the current schema; return how many were migrated."""
+    compact_journals()
+    migrated = sum(1 for year, month in list_stats_months() if migrate_month(year, month))
+    if migrated:
+        _logger.info("months-migrated count=%d version=%d", migrated, SCHEMA_VERSION)
+    return migrated
+
+
 def save_stats(stats, year=None, month=None):
     """Save session statistics to a month file.
 
@@ -71,39 +1148,417 @@ def save_stats(stats, year=None, month=None):
             month = now.month
 
         stats_path = get_stats_path_for_month(year, month)
-        with open(stats_path, 'w') as f:
-            json.dump(stats, f, indent=2)
+        _write_json_atomic(stats_path, stats)
     except Exception:
         _logger.exception("stats-save-error year=%s month=%s", year, month)
 
 
+def _rewrite_month_file(sessions, year, month, sort=False, fold_journal=False):
+    """Merge sessions into the month file by start time and atomically rewrite it.
+
+    If another process rewrote the month meanwhile, the merge is redone
+    against its version so neither writer's sessions are lost. sort=True
+    puts the merged sessions back in chronological order (for backfills).
+    fold_journal=True also folds the month's journal into the same rewrite
+    and removes it (this is how compact_journal() works).
+    Raises if the month file cannot be read, leaving it untouched.
+    """
+    month_stats_path = get_stats_path_for_month(year, month)
+    journal_path = get_journal_path_for_month(year, month)
+    journal_stamp = None
+
+    def build():
+        nonlocal journal_stamp
+        month_stats = {"sessions": []}
+        if os.path.exists(month_stats_path):
+            month_stats = read_month_file(month_stats_path)
+        if fold_journal:
+            journal_stamp = file_stamp(journal_path)
+            merge_sessions(month_stats["sessions"], load_journal(journal_path))
+        merge_sessions(month_stats["sessions"], sessions)
+        if sort:
+            month_stats["sessions"].sort(key=_sort_key)
+        return upgrade_month_data(month_stats)
+
+    def remove_journal():
+        # Only drop the journal if nothing was appended since it was read; otherwise
+        # keep it, as dedup-by-start-time makes the already-folded lines harmless.
+        if journal_stamp is not None and file_stamp(journal_path) == journal_stamp:
+            os.remove(journal_path)
+
+    _swap_in_month_file(year, month, month_stats_path, build, after_swap=remove_journal if fold_journal else None)
+
+
+def _session_month(session):
+    """Return the (year, month) a session is filed under (its local start month)."""
+    day = date.fromordinal(session_day_ordinal(session))
+    return day.year, day.month
+
+
+class MonthFileStore:
+    """Stores sessions in YYYY-MM.json month files, optionally through journals."""
+
+    supports_queries = False
+
+    def __init__(self, journal=True):
+        self.journal = journal
+
+    def load_all(self):
+        """Load every stored session."""
+        return load_stats()["sessions"]
+
+    def load_month(self, year, month):
+        """Load sessions stored for the given month."""
+        return load_month_sessions(year, month)
+
+    def month_signature(self, year, month):
+        """Return a cheap fingerprint of a month's stored sessions."""
+        return month_file_signature(year, month)
+
+    def iter_sessions(self, start=None, end=None):
+        """Stream stored sessions whose start time falls in [start, end)."""
+        return iter_stored_sessions(start, end)
+
+    def list_months(self):
+        """Return sorted (year, month) pairs that have stored sessions."""
+        return list_stats_months()
+
+    def save_session(self, session):
+        """Persist one finished session to its month."""
+        self.save_sessions([session])
+
+    def save_sessions(self, sessions):
+        """Persist a batch of finished sessions with one write per month."""
+        by_month = {}
+        for session in sessions:
+            by_month.setdefault(_session_month(session), []).append(session)
+
+        for (year, month), month_sessions in by_month.items():
+            if self.journal:
+                # Appended lines; compact() folds them into the month file.
+                try:
+                    append_journal(month_sessions, year, month)
+                except Exception:
+                    _logger.exception("journal-append-error year=%s month=%s", year, month)
+            else:
+                try:
+                    _rewrite_month_file(month_sessions, year, month)
+                except Exception:
+                    _logger.exception("stats-save-error year=%s month=%s", year, month)
+
+    def import_month(self, year, month, sessions):
+        """Merge a batch of sessions (and the month's pending journal) into one month file rewrite.
+
+        Raises if the month file cannot be read; it is then left as it was.
+        """
+        _rewrite_month_file(sessions, year, month, sort=True, fold_journal=True)
+
+    def compact(self):
+        """Fold pending journals into month files and archive closed months."""
+        compacted = compact_journals()
+        migrate_stats_files()
+        if auto_archive_enabled():
+            archive_closed_months()
+        return compacted
+
+    def close(self):
+        """Nothing to release for plain files."""
+
+
+def import_sessions(store, sessions):
+    """Bulk-add sessions to a store, writing each affected month once.
+
+    Sessions are grouped by month, sorted and deduped by start time against
+    each other and the month's stored sessions. Each month's rollup is then
+    rebuilt in one pass, so the app's day/range/streak indexes pick the
+    import up from the rollups. A month whose stored file cannot be read is
+    skipped rather than rewritten. Returns {"added", "duplicates", "months",
+    "failed"}, where failed lists the skipped (year, month) pairs.
+    """
+    by_month = {}
+    for session in sessions:
+        by_month.setdefault(_session_month(session), []).append(session)
+
+    added = 0
+    duplicates = 0
+    months = []
+    failed = []
+    for year, month in sorted(by_month):
+        existing = store.load_month(year, month)
+        seen = {_session_key(s) for s in existing}
+        fresh = []
+        for session in sorted(by_month[(year, month)], key=_sort_key):
+            key = _session_key(session)
+            if key in seen:
+                duplicates += 1
+                continue
+            seen.add(key)
+            fresh.append(session)
+        if not fresh:
+            continue
+        try:
+            store.import_month(year, month, fresh)
+        except Exception:
+            # load_month() reads an unreadable file as empty, so neither the
+            # dedupe above nor a rewrite can be trusted for this month.
+            _logger.exception("sessions-import-error year=%s month=%s", year, month)
+            failed.append((year, month))
+            continue
+        save_month_rollup(year, month, build_month_rollup(existing + fresh), store.month_signature(year, month))
+        added += len(fresh)
+        months.append((year, month))
+
+    _logger.info(
+        "sessions-imported added=%d duplicates=%d months=%d failed=%d",
+        added, duplicates, len(months), len(failed),
+    )
+    return {"added": added, "duplicates": duplicates, "months": months, "failed": failed}
+
+
+def normalize_labels(project=None, tags=()):
+    """Return (project or None, [tags]) cleaned up for storage.
+
+    tags may be a list or a comma-separated string; tags are lower-cased and
+    deduplicated in order, and blank names are dropped.
+    """
+    project = project.strip() if isinstance(project, str) else None
+    if isinstance(tags, str):
+        tags = tags.split(",")
+    cleaned = []
+    for tag in tags or ():
+        tag = str(tag).strip().lower()
+        if tag and tag not in cleaned:
+            cleaned.append(tag)
+    return project or None, cleaned
+
+
+def _ordinal_range(start, end):
+    """Return (first, last) day ordinals for optional start/end dates."""
+    return (start.toordinal() if start else None), (end.toordinal() if end else None)
+
+
+def _months_between(start, end):
+    """Yield (year, month) pairs touched by the datetime range [start, end)."""
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        yield year, month
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def _sort_key(session):
+    """Chronological sort key for sessions."""
+    return session.get("start_time") or ""
+
+
+class StatsWriter:
+    """Write-behind persistence thread fed by a bounded queue.
+
+    Sessions drained from the queue together are saved as one batch; jobs
+    submitted with submit() run after the sessions of the same drain, in
+    order, and jobs submitted with submit_once() run once per drain however
+    often they were queued. A failing job is logged and does not stop the
+    others. A full queue blocks the submitter until the writer catches up.
+    """
+
+    _STOP = object()
+
+    def __init__(self, save_sessions, max_pending=STATS_WRITE_QUEUE_SIZE, max_batch=STATS_WRITE_BATCH_SIZE):
+        self._save_sessions = save_sessions
+        self._max_batch = max_batch
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._thread = threading.Thread(target=self._run, name="stats-writer", daemon=True)
+        self._thread.start()
+
+    def submit_session(self, session):
+        """Queue a finished session for saving."""
+        self._queue.put(("session", session))
+
+    def submit(self, func, *args):
+        """Queue a persistence job to run on the writer thread."""
+        self._queue.put(("job", (func, args)))
+
+    def submit_once(self, func, *args):
+        """Queue a job that runs once per drain even if the same call is queued repeatedly."""
+        self._queue.put(("once", (func, args)))
+
+    def flush(self):
+        """Block until everything queued so far has been written."""
+        self._queue.join()
+
+    def close(self):
+        """Flush pending writes and stop the writer thread."""
+        self._queue.put(("stop", self._STOP))
+        self._thread.join()
+
+    def _run(self):
+        """Drain the queue in batches until stopped."""
+        running = True
+        while running:
+            items = [self._queue.get()]
+            while len(items) < self._max_batch:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            sessions = [payload for kind, payload in items if kind == "session"]
+            jobs = []
+            for kind, payload in items:
+                if kind == "job" or (kind == "once" and payload not in jobs):
+                    jobs.append(payload)
+                elif kind == "stop":
+                    running = False
+            try:
+                if sessions:
+                    try:
+                        self._save_sessions(sessions)
+                    except Exception:
+                        _logger.exception("stats-writer-error sessions=%d", len(sessions))
+                for func, args in jobs:
+                    try:
+                        func(*args)
+                    except Exception:
+                        _logger.exception("stats-writer-job-error job=%s", getattr(func, "__name__", func))
+            finally:
+                for _ in items:
+                    self._queue.task_done()
+
+
+def _append_checkpoint_safe(record):
+    """Append a checkpoint record; a failed checkpoint is logged, never raised."""
+    try:
+        append_checkpoint(record)
+    except Exception:
+        _logger.exception("checkpoint-append-error op=%s", record.get("op"))
+
+
+def create_store(mode=STATS_STORAGE_MODE):
+    """Create the session store for a storage mode ("journal", "json" or "sqlite")."""
+    if mode == "sqlite":
+        from src.stats_db import SqliteStore
+        return SqliteStore()
+    return MonthFileStore(journal=(mode == "journal"))
+
+
 class StatsTracker:
     """Tracks session statistics."""
     
-    def __init__(self):
-        self.stats = load_stats()
+    def __init__(self, store=None, background_writes=True):
+        self.store = store or create_store()
+        # Session and rollup writes go through a write-behind thread so Tk callbacks never block on disk.
+        self._writer = StatsWriter(self.store.save_sessions) if background_writes else None
+        # Only the current month is loaded at startup; older months load on
+        # demand (ensure_month_loaded) or via warm_history_async().
+        now = datetime.now()
+        self._lock = threading.Lock()
+        self._loaded_months = {(now.year, now.month)}
+        self._history_loaded = False
+        self._warmup_thread = None
+        self._rollups = {}
+        # Store signature each cached rollup was last checked against; every
+        # session stored at that signature is counted in the rollup.
+        self._rollup_sources = {}
+        # ((start, end), SessionColumns) for the last columnar view built.
+        self._columns = None
+        # Indexes built from the rollups on first use and then updated by _record_finished,
+        # both on the Tk thread; background threads only fill self._rollups, and
+        # _save_rollup() resets them to None when it merges in other instances' sessions.
+        self._range_totals = None
+        self._interruptions = None
+        self._heatmap = None
+        self._streaks = None
+        self._tag_index = None
+        # Finished sessions are held as compact SessionRecords; dicts only exist at the file boundary.
+        self.stats = {"sessions": sorted(map(_session_record, self.store.load_month(now.year, now.month)), key=_sort_key)}
+        self._date_index = DateIndex(self.stats["sessions"])
         self.current_session = None
         self._slack_segment_start = None
+        self._last_checkpoint = None
+        self.recover_orphaned_sessions()
+
+    def _merge_loaded(self, sessions, months=None, history=False):
+        """Merge freshly loaded sessions into memory in chronological order."""
+        sessions = [_session_record(session) for session in sessions]
+        with self._lock:
+            merged = merge_sessions(list(self.stats["sessions"]), sessions)
+            merged.sort(key=_sort_key)
+            # Swap the list and index so readers never observe a half-merged history.
+            self._date_index = DateIndex(merged)
+            self.stats["sessions"] = merged
+            if months:
+                self._loaded_months.update(months)
+            if history:
+                self._history_loaded = True
+            self._columns = None
+
+    def ensure_month_loaded(self, year, month):
+        """Load one month's sessions into memory if not already loaded."""
+        if self._history_loaded or (year, month) in self._loaded_months:
+            return
+        self._merge_loaded(self.store.load_month(year, month), months={(year, month)})
+
+    def ensure_history_loaded(self):
+        """Load every stored month into memory."""
+        if self._history_loaded:
+            return
+        start = time.perf_counter()
+        self._merge_loaded(self.store.load_all(), history=True)
+        _logger.info(
+            "stats-history-loaded sessions=%d elapsed=%.3fs",
+            len(self.stats["sessions"]),
+            time.perf_counter() - start,
+        )
+
+    def warm_history_async(self, on_loaded=None):
+        """Load older months on a background thread once the window is drawn.
+
+        on_loaded, if given, is called on that thread after the history is in memory.
+        """
+        if self._history_loaded or self._warmup_thread is not None:
+            return
+
+        def _warm():
+            try:
+                self.ensure_history_loaded()
+                if on_loaded is not None:
+                    on_loaded()
+            except Exception:
+                _logger.exception("stats-history-warmup-error")
+
+        self._warmup_thread = threading.Thread(target=_warm, name="stats-warmup", daemon=True)
+        self._warmup_thread.start()
     
-    def start_session(self, initial_time):
-        """Start tracking a new session."""
+    def start_session(self, initial_time, project=None, tags=()):
+        """Start tracking a new session, attributed to an optional project and tags."""
+        project, tags = normalize_labels(project, tags)
+        now = datetime.now()
+        start_ts, utc_offset = local_epoch(now)
         self.current_session = {
-            "start_time": datetime.now().isoformat(),
+            "start_time": now.isoformat(),
+            "start_ts": start_ts,
+            "utc_offset": utc_offset,
             "initial_productivity_time": initial_time,
             "end_time": None,
+            "end_ts": None,
             "total_slack_time": 0,
             "work_time_actual": 0,
             "slack_events_count": 0,
             "slack_segments": [],
-            "outcome": None
+            "outcome": None,
+            "project": project,
+            "tags": tags
         }
         self._slack_segment_start = None
+        session = {k: v for k, v in self.current_session.items() if k != "slack_segments"}
+        self._checkpoint({"op": "start", "session": session})
+        self._last_checkpoint = time.monotonic()
 
     def start_slack_segment(self, start_time=None):
         """Start a slack segment if not already in one."""
         if self.current_session is None or self._slack_segment_start is not None:
             return
         self._slack_segment_start = start_time or datetime.now()
+        self._checkpoint({"op": "slack_start", "at": self._slack_segment_start.isoformat()})
 
     def end_slack_segment(self, end_time=None):
         """End the current slack segment and store it."""
@@ -111,12 +1566,81 @@ class StatsTracker:
             return
         segment_end = end_time or datetime.now()
         duration = (segment_end - self._slack_segment_start).total_seconds()
-        self.current_session["slack_segments"].append({
+        segment = {
             "start_time": self._slack_segment_start.isoformat(),
             "end_time": segment_end.isoformat(),
-            "duration_seconds": max(int(duration), 0)
-        })
+            "duration_seconds": max(int(duration), 0),
+            "start_ts": local_epoch(self._slack_segment_start)[0],
+            "end_ts": local_epoch(segment_end)[0],
+        }
+        self.current_session["slack_segments"].append(segment)
         self._slack_segment_start = None
+        self._checkpoint({"op": "segment", "segment": segment})
+        self._record_interruption(self.current_session["start_time"], segment["duration_seconds"])
+
+    def _record_interruption(self, session_start_time, duration):
+        """Fold a finished slack segment into its day's rollup and the all-time sketch right away."""
+        year, month = int(session_start_time[:4]), int(session_start_time[5:7])
+        self._get_rollup_days(year, month)
+        with self._lock:
+            # Looked up under the lock: _save_rollup() may have swapped in a merged copy.
+            days = self._rollups[(year, month)]
+            add_interruption_to_rollup(days.setdefault(session_start_time[:10], empty_day_rollup()), duration)
+            if self._interruptions is not None:
+                self._interruptions.add(duration)
+
+    def checkpoint(self, total_slack_time, force=False):
+        """Record the running session's progress, at most every STATS_CHECKPOINT_INTERVAL_SECONDS.
+
+        Cheap enough to call from every timer tick.
+        """
+        if self.current_session is None:
+            return
+        now = time.monotonic()
+        if not force and self._last_checkpoint is not None and now - self._last_checkpoint < STATS_CHECKPOINT_INTERVAL_SECONDS:
+            return
+        self._last_checkpoint = now
+        self._checkpoint({
+            "op": "tick",
+            "at": datetime.now().isoformat(),
+            "slack": int(round(total_slack_time)),
+            "events": self.current_session.get("slack_events_count", 0),
+        })
+
+    def _checkpoint(self, record):
+        """Append a checkpoint delta record, in the background when enabled."""
+        if self._writer is not None:
+            self._writer.submit(_append_checkpoint_safe, record)
+        else:
+            _append_checkpoint_safe(record)
+
+    def recover_orphaned_sessions(self):
+        """Close out sessions left running by instances that crashed or were killed."""
+        recovered = []
+        for path in find_orphaned_checkpoints():
+            try:
+                session = replay_checkpoint(path)
+            except Exception:
+                _logger.exception("checkpoint-replay-error path=%s", path)
+                continue
+            if session is not None and not self._is_stored(session):
+                self._record_finished(session)
+                recovered.append(session)
+                _logger.info("checkpoint-recovered start=%s end=%s", session["start_time"], session["end_time"])
+            # The log is removed only after the recovered session is written.
+            if self._writer is not None:
+                self._writer.submit(clear_checkpoint, path)
+            else:
+                clear_checkpoint(path)
+        return recovered
+
+    def _is_stored(self, session):
+        """Return True if a session with this start time is already stored."""
+        start_time = session.get("start_time")
+        year, month = _session_month(session)
+        self.ensure_month_loaded(year, month)
+        # Exact-key lookup: [start_time, start_time + NUL) only contains start_time itself.
+        return bool(self._date_index.between(start_time, start_time + "\0"))
     
     def end_session(self, total_slack_time, outcome="completed"):
         """End the current session and save it."""
@@ -126,34 +1650,86 @@ class StatsTracker:
         end_time = datetime.now()
         self.end_slack_segment(end_time=end_time)
         self.current_session["end_time"] = end_time.isoformat()
+        self.current_session["end_ts"] = local_epoch(end_time)[0]
         total_slack_time_int = int(round(total_slack_time))
         self.current_session["total_slack_time"] = total_slack_time_int
         initial_time = self.current_session.get("initial_productivity_time", 0)
         self.current_session["work_time_actual"] = max(int(initial_time) - total_slack_time_int, 0)
         self.current_session["outcome"] = outcome
 
-        # Extract year and month from session start time for file organization
-        start_dt = datetime.fromisoformat(self.current_session["start_time"])
-        year = start_dt.year
-        month = start_dt.month
+        session = self.current_session
+        self.current_session = None
+        self._last_checkpoint = None
+        self._record_finished(session, segments_recorded=True)
+        # Queued behind the session save, so the log only goes once the session is on disk.
+        if self._writer is not None:
+            self._writer.submit(clear_checkpoint, get_checkpoint_path())
+        else:
+            clear_checkpoint()
+
+    def _record_finished(self, session, segments_recorded=False):
+        """Add a finished session to memory and its rollup, then persist it.
 
-        # Load existing sessions for this month
-        month_stats_path = get_stats_path_for_month(year, month)
-        month_stats = {"sessions": []}
-        if os.path.exists(month_stats_path):
-            try:
-                with open(month_stats_path, 'r') as f:
-                    month_stats = json.load(f)
-            except Exception:
-                _logger.exception("month-stats-load-error path=%s", month_stats_path)
+        segments_recorded means its slack segments were already folded in by end_slack_segment().
+        """
+        session = _session_record(session)
+        year, month = _session_month(session)
+        # Load the rollup before the session joins memory so a rebuild cannot count it twice.
+        self._get_rollup_days(year, month)
 
-        # Add current session to month file
-        month_stats["sessions"].append(self.current_session)
-        save_stats(month_stats, year, month)
+        # Update in-memory stats for the session right away; disk catches up behind.
+        with self._lock:
+            # Looked up under the lock: _save_rollup() may have swapped in a merged copy.
+            add_session_to_rollup(self._rollups[(year, month)], session, include_segments=not segments_recorded)
+            if self._interruptions is not None and not segments_recorded:
+                for seg in session.get("slack_segments", []):
+                    if seg.get("duration_seconds") is not None:
+                        self._interruptions.add(seg["duration_seconds"])
+            if self._heatmap is not None:
+                self._heatmap.add(session_heat_cells(session))
+            ordinal = session_day_ordinal(session)
+            values = session_rollup_values(session)
+            if self._range_totals is not None:
+                self._range_totals.add(ordinal, values)
+            if self._streaks is not None:
+                self._streaks.add(ordinal, values[_ACTUAL])
+            if self._tag_index is not None:
+                self._tag_index.add_session(
+                    session["start_time"], ordinal, session.get("project"), session.get("tags") or (),
+                    values[_ACTUAL], values[_SLACK],
+                )
+            self.stats["sessions"].append(session)
+            self._date_index.add(session)
+            self._columns = None
 
-        # Update in-memory stats for the session
-        self.stats["sessions"].append(self.current_session)
-        self.current_session = None
+        self._persist(session, year, month)
+
+    def _persist(self, session, year, month):
+        """Save a session and its month rollup, in the background when enabled."""
+        if self._writer is not None:
+            self._writer.submit_session(session)
+            self._writer.submit_once(self._save_rollup, year, month)
+        else:
+            self.store.save_session(session)
+            self._save_rollup(year, month)
+
+    def flush(self):
+        """Block until all queued session writes are on disk."""
+        if self._writer is not None:
+            self._writer.flush()
+
+    def compact(self):
+        """Compact the store (fold journals / checkpoint the database)."""
+        self.flush()
+        return self.store.compact()
+
+    def close(self):
+        """Flush pending writes, compact and release the store; call once on app shutdown."""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        self.compact()
+        self.store.close()
     
     def reset_session(self, total_slack_time):
         """Mark session as reset early."""
@@ -161,52 +1737,362 @@ class StatsTracker:
             self.end_session(total_slack_time, outcome="reset_early")
     
     def get_all_sessions(self):
-        """Get all recorded sessions."""
+        """Get all recorded sessions (loads the full history if needed)."""
+        self.ensure_history_loaded()
         return self.stats["sessions"]
 
     def compute_session_metrics(self, session):
         """Compute derived metrics for a session."""
-        start_time = session.get("start_time")
-        end_time = session.get("end_time")
-        initial_time = session.get("initial_productivity_time", 0)
-        total_slack = session.get("total_slack_time", 0)
+        return compute_session_metrics(session)
 
-        wall_clock_duration = 0
-        if start_time and end_time:
+    def get_sessions_between(self, start, end):
+        """Return sessions (with metrics) whose start time falls in [start, end)."""
+        if self.store.supports_queries:
+            # The query reads the database, so queued sessions must land first.
+            self.flush()
+            sessions = self.store.sessions_between(start, end)
+        else:
+            return [self._with_metrics(s) for s in self.sessions_between(start, end)]
+        return [{**session, **self.compute_session_metrics(session)} for session in sessions]
+
+    def iter_sessions(self, start=None, end=None, with_metrics=False):
+        """Stream sessions starting in [start, end) straight from storage.
+
+        start/end may be dates (midnight) or datetimes; None is unbounded.
+        Only months in range are read and sessions are yielded one at a time,
+        so memory stays bounded regardless of history size.
+        """
+        if start is not None and not isinstance(start, datetime):
+            start = datetime(start.year, start.month, start.day)
+        if end is not None and not isinstance(end, datetime):
+            end = datetime(end.year, end.month, end.day)
+        # Queued sessions must reach storage before it is streamed.
+        self.flush()
+        for session in self.store.iter_sessions(start, end):
+            if with_metrics:
+                yield {**session, **compute_session_metrics(session)}
+            else:
+                yield session
+
+    def sessions_between(self, start, end):
+        """Return in-memory sessions whose start time falls in [start, end) via the date index."""
+        for year, month in _months_between(start, end - timedelta(microseconds=1)):
+            self.ensure_month_loaded(year, month)
+        return self._date_index.between(start.isoformat(), end.isoformat())
+
+    def sessions_on(self, day):
+        """Return in-memory sessions that started on the given local date."""
+        start = datetime(day.year, day.month, day.day)
+        return self.sessions_between(start, start + timedelta(days=1))
+
+    def get_sessions_on(self, day):
+        """Return sessions (with metrics) that started on the given local date."""
+        start = datetime(day.year, day.month, day.day)
+        return self.get_sessions_between(start, start + timedelta(days=1))
+
+    def get_day_counts(self, year, month):
+        """Return {date: session_count} for the given month."""
+        if self.store.supports_queries:
+            self.flush()
+            return self.store.day_counts(year, month)
+        return {day: rollup["sessions"] for day, rollup in self.get_month_rollups(year, month).items()}
+
+    def get_month_rollups(self, year, month):
+        """Return {date: per-day rollup} for the given month.
+
+        Rollups are read from YYYY-MM.rollup.json and rebuilt from the month's
+        sessions only when the file is missing or stale.
+        """
+        days = self._get_rollup_days(year, month)
+        rollups = {}
+        for key, rollup in days.items():
             try:
-                start_dt = datetime.fromisoformat(start_time)
-                end_dt = datetime.fromisoformat(end_time)
-                wall_clock_duration = max(int((end_dt - start_dt).total_seconds()), 0)
+                rollups[datetime.strptime(key, "%Y-%m-%d").date()] = rollup
             except ValueError:
-                wall_clock_duration = 0
+                continue
+        return rollups
 
-        if session.get("outcome") == "completed":
-            actual_focus_time = int(initial_time)
-        elif wall_clock_duration:
-            actual_focus_time = max(int(wall_clock_duration - total_slack), 0)
-        else:
-            actual_focus_time = max(int(initial_time - total_slack), 0)
-        slack_ratio = (total_slack / (actual_focus_time + total_slack)) if (actual_focus_time + total_slack) else 0
-        overrun_time = wall_clock_duration - initial_time
+    def get_day_rollup(self, day):
+        """Return the rollup for a single date (zeroed if there were no sessions)."""
+        days = self._get_rollup_days(day.year, day.month)
+        return days.get(day.isoformat(), empty_day_rollup())
+
+    def get_range_totals(self, start, end):
+        """Return summed rollup totals for the dates in [start, end] (inclusive).
+
+        Backed by Fenwick trees over daily buckets, so a query costs O(log days)
+        and each finished session updates them in O(log days).
+        longest_interruption is not additive and is always None here.
+        """
+        totals = self._get_range_index().totals(start.toordinal(), end.toordinal())
+        rollup = dict(zip(ROLLUP_SUM_FIELDS, totals))
+        rollup["longest_interruption"] = None
+        return rollup
 
+    def get_interruption_summary(self, day=None):
+        """Return p50/p90/p99, max and a histogram of interruption lengths for a date, or all time.
+
+        Read from streaming sketches kept up to date as slack segments end,
+        so no segment is rescanned.
+        """
+        if day is not None:
+            return self.get_day_rollup(day)["interruptions"].summary()
+        sketch = self._interruptions
+        if sketch is None:
+            sketch = DurationSketch()
+            for _, rollup in self._iter_day_rollups():
+                sketch.merge(rollup["interruptions"])
+            self._interruptions = sketch
+        return sketch.summary()
+
+    def get_heatmap(self):
+        """Return the all-time weekday x hour-of-day WeekHourHeatmap of slack and focus seconds.
+
+        Built once from the per-day rollups, then updated by each end_session(),
+        so reading it is O(168) however long the history is.
+        """
+        heatmap = self._heatmap
+        if heatmap is None:
+            heatmap = WeekHourHeatmap()
+            for _, rollup in self._iter_day_rollups():
+                heatmap.add(rollup["heatmap"])
+            self._heatmap = heatmap
+        return heatmap
+
+    def get_streak_summary(self, today=None):
+        """Return the daily focus goal, today's focus and the current and best goal streaks.
+
+        The streak counters are kept up to date by end_session(), so this
+        never rescans the session history.
+        """
+        today = today or date.today()
+        streaks = self._get_goal_streaks()
+        ordinal = today.toordinal()
         return {
-            "wall_clock_duration": wall_clock_duration,
-            "actual_focus_time": actual_focus_time,
-            "slack_ratio": slack_ratio,
-            "overrun_time": overrun_time
+            "goal": streaks.goal,
+            "today_focus": streaks.focus_on(ordinal),
+            "current": streaks.current(ordinal),
+            "best": streaks.best,
         }
 
+    def set_daily_goal(self, seconds):
+        """Change and save the daily focus goal; the streaks are recomputed once."""
+        seconds = int(seconds)
+        if seconds <= 0:
+            raise ValueError("daily goal must be positive")
+        save_daily_goal(seconds)
+        streaks = self._get_goal_streaks()
+        with self._lock:
+            streaks.set_goal(seconds)
+        _logger.info("daily-goal-set seconds=%s", seconds)
+
+    def get_label_names(self):
+        """Return (project names, tag names) used by any stored session."""
+        return self._get_tag_index().names()
+
+    def get_label_session_ids(self, project=None, tags=(), start=None, end=None):
+        """Return start_time ids of sessions with the project and every tag, optionally within [start, end] dates."""
+        first, last = _ordinal_range(start, end)
+        return set(self._get_tag_index().matches(project, tags, first, last))
+
+    def get_label_totals(self, project=None, tags=(), start=None, end=None):
+        """Return session count and actual/slack seconds for a project and/or tags, e.g. one project this month.
+
+        Answered from the tag index postings, without reading any sessions.
+        """
+        first, last = _ordinal_range(start, end)
+        return self._get_tag_index().totals(project, tags, first, last)
+
+    def _get_tag_index(self):
+        """Return the project/tag inverted index, building it from the day rollups on first use."""
+        index = self._tag_index
+        if index is None:
+            index = TagIndex()
+            for ordinal, rollup in self._iter_day_rollups():
+                for kind in ("projects", "tags"):
+                    for name, postings in rollup[kind].items():
+                        for session_id, (actual, slack) in postings.items():
+                            index.add(kind, name, session_id, ordinal, actual, slack)
+            self._tag_index = index
+        return index
+
+    def _get_goal_streaks(self):
+        """Return the goal streak counters, building them from the day rollups on first use."""
+        streaks = self._streaks
+        if streaks is None:
+            daily = {ordinal: rollup["actual"] for ordinal, rollup in self._iter_day_rollups()}
+            streaks = GoalStreaks(load_daily_goal(), daily)
+            self._streaks = streaks
+        return streaks
+
+    def _get_range_index(self):
+        """Return the per-day Fenwick index, building it from the month rollups on first use."""
+        index = self._range_totals
+        if index is None:
+            daily = {
+                ordinal: [rollup[field] for field in ROLLUP_SUM_FIELDS]
+                for ordinal, rollup in self._iter_day_rollups()
+            }
+            index = DayRangeTotals(ROLLUP_SUM_FIELDS, daily)
+            self._range_totals = index
+        return index
+
+    def _iter_day_rollups(self):
+        """Yield (day ordinal, rollup) for every stored day, month by month."""
+        for year, month in self._history_months():
+            for key, rollup in self._get_rollup_days(year, month).items():
+                try:
+                    ordinal = date.fromisoformat(key).toordinal()
+                except ValueError:
+                    continue
+                yield ordinal, rollup
+
+    def _history_months(self):
+        """Return every stored (year, month), after any queued writes have landed."""
+        self.flush()
+        return self.store.list_months()
+
+    def preload_rollups(self):
+        """Load every stored month's day rollup into memory.
+
+        Meant for the warm-up thread: the streak, range, heatmap and tag
+        indexes are then built from memory on the Tk thread, which is also
+        the thread that updates them as sessions end.
+        """
+        for year, month in self._history_months():
+            self._get_rollup_days(year, month)
+
+    def _get_rollup_days(self, year, month):
+        """Return the cached {YYYY-MM-DD: rollup} mapping for a month, loading it if needed."""
+        with self._lock:
+            days = self._rollups.get((year, month))
+        if days is not None:
+            return days
+        self.flush()
+        signature = self.store.month_signature(year, month)
+        days = load_month_rollup(year, month, signature)
+        if days is None:
+            days = build_month_rollup(self.store.load_month(year, month))
+            save_month_rollup(year, month, days, signature)
+        with self._lock:
+            # Another thread may have loaded the month (and added sessions to it) meanwhile; keep its copy.
+            if (year, month) not in self._rollups:
+                self._rollups[(year, month)] = days
+                self._rollup_sources[(year, month)] = signature
+            return self._rollups[(year, month)]
+
+    def _save_rollup(self, year, month):
+        """Persist a month's in-memory rollup, first merging in sessions other instances stored.
+
+        Runs after the month's sessions were saved. Unless the store signature
+        is the one this instance last checked, the stored sessions are loaded
+        unlocked and compared with the session ids the rollup has counted; the
+        month lock is only taken to re-check the signature, and the load is
+        redone under it if another writer got in between. Sessions the rollup
+        lacks are folded into a copy that replaces the cached rollup, and the
+        indexes built from the rollups are dropped so they rebuild with them.
+        The file is stamped with the signature the load matched, so the
+        rollup is never marked fresh for sessions it does not count.
+        """
+        key = (year, month)
+        with self._lock:
+            if key not in self._rollups:
+                return
+            seen = self._rollup_sources.get(key)
+        signature = self.store.month_signature(year, month)
+        missing = []
+        if signature != seen:
+            stored = self.store.load_month(year, month)
+            with month_lock(year, month):
+                current = self.store.month_signature(year, month)
+                if current != signature:
+                    signature = current
+                    stored = self.store.load_month(year, month)
+            with self._lock:
+                days = self._rollups[key]
+                counted = {session_id for rollup in days.values() for session_id in rollup["ids"]}
+                missing = [session for session in stored if _session_key(session) not in counted]
+                if missing:
+                    days = copy_month_rollup(days)
+                    for session in missing:
+                        add_session_to_rollup(days, session)
+                    self._rollups[key] = days
+                    self._range_totals = None
+                    self._interruptions = None
+                    self._heatmap = None
+                    self._streaks = None
+                    self._tag_index = None
+                self._rollup_sources[key] = signature
+        if missing:
+            _logger.info("rollup-merged month=%04d-%02d sessions=%d", year, month, len(missing))
+        with self._lock:
+            snapshot = copy_month_rollup(self._rollups[key])
+        save_month_rollup(year, month, snapshot, signature)
+
     def get_sessions_with_metrics(self):
         """Return sessions with derived metrics included."""
-        return [
-            {**session, **self.compute_session_metrics(session)}
-            for session in self.stats["sessions"]
-        ]
-    
+        return [self._with_metrics(session) for session in self.get_all_sessions()]
+
+    def _with_metrics(self, session):
+        """Return the session-with-metrics view for an in-memory session.
+
+        Records are read-only, so the view is memoized on the record itself.
+        """
+        if isinstance(session, SessionRecord):
+            return session.with_metrics(compute_session_metrics)
+        return {**session, **compute_session_metrics(session)}
+
+    def get_session_columns(self, start=None, end=None):
+        """Return a columnar view of sessions on dates in [start, end] for vectorized aggregations.
+
+        Only the months in range are loaded (None bounds load the full history).
+        Uses NumPy arrays when available and falls back to pure Python otherwise.
+        The last view is reused until the in-memory history changes.
+        """
+        from src.stats_columns import SessionColumns
+
+        key = (start, end)
+        cached = self._columns
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        if start is not None and end is not None:
+            sessions = self.sessions_between(
+                datetime(start.year, start.month, start.day),
+                datetime(end.year, end.month, end.day) + timedelta(days=1),
+            )
+        else:
+            sessions = self.get_all_sessions()
+        columns = SessionColumns(sessions)
+        self._columns = (key, columns)
+        return columns
+
+    def get_period_totals(self, period="day", start=None, end=None):
+        """Return {period start date: totals} grouped by "day", "week" or "month"."""
+        return self.get_session_columns(start, end).totals_by(period, start, end)
+
+    def get_range_insights(self, start, end):
+        """Return the most disrupted session and longest interruption for dates in [start, end].
+
+        Complements get_range_totals(), whose additive index cannot answer either.
+        """
+        columns = self.get_session_columns(start, end)
+        most_disrupted, ratio = columns.most_disrupted(start, end)
+        return {
+            "most_disrupted": most_disrupted,
+            "most_disrupted_ratio": ratio,
+            "longest_interruption": columns.longest_interruption(start, end),
+        }
+
     def get_session_count(self):
         """Get total number of sessions."""
-        return len(self.stats["sessions"])
+        return len(self.get_all_sessions())
     
     def get_completed_sessions(self):
         """Get only completed sessions."""
-        return [s for s in self.stats["sessions"] if s["outcome"] == "completed"]
+        return [s for s in self.get_all_sessions() if s["outcome"] == "completed"]
+
+
+if __name__ == "__main__":
+    import sys
+    from src.stats_cli import main
+    sys.exit(main())
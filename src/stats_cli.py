@@ -0,0 +1,447 @@
+"""Command-line tools for TrueFocus Timer stats.
+
+Run as ``python -m src.stats <command>``. Only stdlib and the src.stats
+modules are imported, so the commands work without a display (no
+tkinter/pynput).
+"""
+
+import os
+import sys
+import csv
+import json
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+
+from src import stats
+from src.config import STATS_EXPORT_CHUNK_ROWS
+from src.stats_export import EXPORT_FORMATS, export_tables
+from src.stats_import import read_sessions_csv
+
+TEAM_LABEL = "TEAM"
+_STATS_DIR_NAMES = ("stats", ".productivity_clock")
+_TOTAL_FIELDS = ("sessions", "planned", "actual", "slack", "slack_events", "completed", "reset_early")
+
+
+def empty_totals():
+    """Return zeroed aggregate totals."""
+    return dict.fromkeys(_TOTAL_FIELDS, 0)
+
+
+def add_session_totals(totals, session):
+    """Fold one session into aggregate totals using the dashboard's metric definitions."""
+    metrics = stats.compute_session_metrics(session)
+    totals["sessions"] += 1
+    totals["planned"] += session.get("initial_productivity_time", 0)
+    totals["actual"] += metrics["actual_focus_time"]
+    totals["slack"] += session.get("total_slack_time", 0)
+    totals["slack_events"] += session.get("slack_events_count", 0)
+    outcome = session.get("outcome")
+    if outcome == "completed":
+        totals["completed"] += 1
+    elif outcome == "reset_early":
+        totals["reset_early"] += 1
+
+
+def merge_totals(into, other):
+    """Add one set of totals into another."""
+    for field in _TOTAL_FIELDS:
+        into[field] += other[field]
+    return into
+
+
+def derived_rates(totals):
+    """Return slack ratio, completion rate and reset-early rate for totals."""
+    focus_and_slack = totals["actual"] + totals["slack"]
+    sessions = totals["sessions"]
+    return {
+        "slack_ratio": (totals["slack"] / focus_and_slack) if focus_and_slack else 0,
+        "completion_rate": (totals["completed"] / sessions) if sessions else 0,
+        "reset_early_rate": (totals["reset_early"] / sessions) if sessions else 0,
+    }
+
+
+def period_key(start_time, period):
+    """Return the ISO date of the day (or the week's Monday) a session belongs to."""
+    day = date.fromisoformat(start_time[:10])
+    if period == "week":
+        day -= timedelta(days=day.weekday())
+    return day.isoformat()
+
+
+def format_seconds(total_seconds):
+    """Format seconds to H:MM:SS (same as the dashboard)."""
+    total_seconds = int(abs(total_seconds))
+    hours = total_seconds // 3600
+    minutes = (total_seconds % 3600) // 60
+    seconds = total_seconds % 60
+    return f"{hours:d}:{minutes:02d}:{seconds:02d}"
+
+
+def discover_user_stats_dirs(roots):
+    """Map user name -> stats directories found under the given roots.
+
+    A root that itself holds month files is one user (named after the
+    folder above .productivity_clock/stats); otherwise each top-level
+    subfolder containing month files somewhere below is a user.
+    """
+    users = {}
+    for root in roots:
+        root = os.path.abspath(root)
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames.sort()
+            if not any(stats.is_stats_filename(name) for name in filenames):
+                continue
+            rel = os.path.relpath(dirpath, root)
+            if rel == os.curdir:
+                path = root
+                while os.path.basename(path) in _STATS_DIR_NAMES:
+                    path = os.path.dirname(path)
+                name = os.path.basename(path)
+            else:
+                name = rel.split(os.sep)[0]
+            users.setdefault(name, []).append(dirpath)
+    return users
+
+
+def _aggregate_stats_dirs(stats_dirs, period):
+    """Worker: return {period: totals} for one user's stats directories."""
+    by_period = {}
+    for stats_dir in stats_dirs:
+        stats.set_stats_dir(stats_dir)
+        for session in stats.iter_stored_sessions():
+            key = period_key(session["start_time"], period)
+            add_session_totals(by_period.setdefault(key, empty_totals()), session)
+    return by_period
+
+
+def _rollup_rows(per_user):
+    """Flatten {user: {period: totals}} plus team totals into output rows."""
+    team = {}
+    rows = []
+    for user in sorted(per_user):
+        for key in sorted(per_user[user]):
+            totals = per_user[user][key]
+            merge_totals(team.setdefault(key, empty_totals()), totals)
+            rows.append({"user": user, "period": key, **totals, **derived_rates(totals)})
+    for key in sorted(team):
+        rows.append({"user": TEAM_LABEL, "period": key, **team[key], **derived_rates(team[key])})
+    return rows
+
+
+def _write_rows(rows, fmt, out):
+    """Write rollup rows as a text table, CSV or JSON."""
+    if fmt == "json":
+        json.dump(rows, out, indent=2)
+        out.write("\n")
+        return
+    if fmt == "csv":
+        if rows:
+            writer = csv.DictWriter(out, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+        return
+    out.write(f"{'User':<16} {'Period':<10} {'Sessions':>8} {'Focus':>10} {'Slack':>10}"
+              f" {'Slack %':>8} {'Done %':>7} {'Reset %':>8}\n")
+    for row in rows:
+        out.write(
+            f"{row['user'][:16]:<16} {row['period']:<10} {row['sessions']:>8}"
+            f" {format_seconds(row['actual']):>10} {format_seconds(row['slack']):>10}"
+            f" {row['slack_ratio'] * 100:>7.0f}% {row['completion_rate'] * 100:>6.0f}%"
+            f" {row['reset_early_rate'] * 100:>7.0f}%\n"
+        )
+
+
+def report_range(period, anchor, first=None, last=None):
+    """Return the inclusive (first, last) dates a report covers."""
+    if period == "day":
+        return anchor, anchor
+    if period == "week":
+        monday = anchor - timedelta(days=anchor.weekday())
+        return monday, monday + timedelta(days=6)
+    if period == "month":
+        first_day = anchor.replace(day=1)
+        next_month = (first_day + timedelta(days=32)).replace(day=1)
+        return first_day, next_month - timedelta(days=1)
+    return first or anchor, last or anchor
+
+
+def build_report(first, last):
+    """Stream stored sessions in [first, last] into the dashboard's headline metrics and insights."""
+    start = datetime(first.year, first.month, first.day)
+    end = datetime(last.year, last.month, last.day) + timedelta(days=1)
+    store = stats.create_store()
+    days = {}
+    most_disrupted = None
+    max_ratio = -1
+    try:
+        for session in store.iter_sessions(start, end):
+            stats.add_session_to_rollup(days, session)
+            ratio = stats.compute_session_metrics(session)["slack_ratio"]
+            if ratio > max_ratio:
+                max_ratio = ratio
+                most_disrupted = session
+    finally:
+        store.close()
+
+    summary = stats.summarize_rollup(stats.combine_rollups(days.values()))
+    return {
+        "from": first.isoformat(),
+        "to": last.isoformat(),
+        **summary,
+        "most_disrupted": most_disrupted["start_time"] if most_disrupted else None,
+        "most_disrupted_ratio": max_ratio if most_disrupted else None,
+        "days": [
+            {"date": day, **stats.summarize_rollup(days[day])}
+            for day in sorted(days)
+        ],
+    }
+
+
+def _flatten_interruptions(row):
+    """Replace a summary's nested interruption sketch summary with flat CSV columns."""
+    row = dict(row)
+    interruptions = row.pop("interruptions", None) or {}
+    for key in ("p50", "p90", "p99"):
+        row[f"interruption_{key}"] = interruptions.get(key)
+    for label, count in (interruptions.get("histogram") or {}).items():
+        row[f"interruptions_{label}"] = count
+    return row
+
+
+def _write_report(report, fmt, out):
+    """Write a report as text, CSV (one row per day) or JSON."""
+    if fmt == "json":
+        json.dump(report, out, indent=2)
+        out.write("\n")
+        return
+    if fmt == "csv":
+        rows = [_flatten_interruptions(day) for day in report["days"]]
+        if rows:
+            writer = csv.DictWriter(out, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+        return
+
+    span = report["from"] if report["from"] == report["to"] else f"{report['from']} to {report['to']}"
+    out.write(f"Focus report: {span}\n\n")
+    out.write(f"  Planned Focus          {format_seconds(report['planned'])}\n")
+    out.write(f"  Actual Focus           {format_seconds(report['actual'])}\n")
+    out.write(f"  Slack (Interruptions)  {format_seconds(report['slack'])}\n")
+    out.write(f"  Focus Efficiency       {report['efficiency'] * 100:.0f}%\n\n")
+    if report["most_disrupted"]:
+        disrupted = datetime.fromisoformat(report["most_disrupted"])
+        disrupted_label = f"{disrupted:%Y-%m-%d %H:%M} ({report['most_disrupted_ratio'] * 100:.0f}% slack)"
+    else:
+        disrupted_label = "-"
+    longest = report["longest_interruption"]
+    longest_label = format_seconds(longest) if longest is not None else "-"
+    out.write(f"  Sessions               {report['sessions']}\n")
+    out.write(f"  Avg Slack / Session    {format_seconds(report['avg_slack'])}\n")
+    out.write(f"  Most Disrupted         {disrupted_label}\n")
+    out.write(f"  Longest Interruption   {longest_label}\n")
+    interruptions = report["interruptions"]
+    if interruptions and interruptions["count"]:
+        quantiles = " / ".join(format_seconds(interruptions[key]) for key in ("p50", "p90", "p99"))
+        mix = "  ".join(f"{label} {count}" for label, count in interruptions["histogram"].items() if count)
+        out.write(f"  Interruption p50/90/99 {quantiles}\n")
+        out.write(f"  Interruption Mix       {mix}\n")
+
+    if report["from"] != report["to"] and report["days"]:
+        out.write(f"\n{'Date':<10} {'Sessions':>8} {'Focus':>10} {'Slack':>10} {'Efficiency':>10}\n")
+        for day in report["days"]:
+            out.write(
+                f"{day['date']:<10} {day['sessions']:>8} {format_seconds(day['actual']):>10}"
+                f" {format_seconds(day['slack']):>10} {day['efficiency'] * 100:>9.0f}%\n"
+            )
+
+
+def _cmd_report(args):
+    """Print or export headline metrics and insights for a day, week, month or range."""
+    try:
+        anchor = date.fromisoformat(args.date) if args.date else date.today()
+        first = date.fromisoformat(args.start) if args.start else None
+        last = date.fromisoformat(args.end) if args.end else None
+    except ValueError as exc:
+        print(f"Invalid date: {exc}", file=sys.stderr)
+        return 2
+    first, last = report_range(args.period, anchor, first, last)
+    if first > last:
+        print("--from must not be after --to", file=sys.stderr)
+        return 2
+
+    report = build_report(first, last)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8", newline="") as out:
+            _write_report(report, args.format, out)
+    else:
+        _write_report(report, args.format, sys.stdout)
+    return 0
+
+
+def _cmd_export(args):
+    """Stream sessions and their slack segments into flat CSV or Parquet tables."""
+    try:
+        start = datetime.fromisoformat(args.start) if args.start else None
+        end = datetime.fromisoformat(args.end) + timedelta(days=1) if args.end else None
+    except ValueError as exc:
+        print(f"Invalid date: {exc}", file=sys.stderr)
+        return 2
+
+    store = stats.create_store()
+    try:
+        result = export_tables(store.iter_sessions(start, end), args.output_dir, args.format, args.chunk_rows)
+    except RuntimeError as exc:
+        print(str(exc), file=sys.stderr)
+        return 1
+    finally:
+        store.close()
+    print(f"Wrote {result['session_rows']} session(s) to {result['sessions']}")
+    print(f"Wrote {result['segment_rows']} slack segment(s) to {result['slack_segments']}")
+    return 0
+
+
+def _cmd_import(args):
+    """Validate sessions from CSV and merge them into the stats store month by month."""
+    try:
+        sessions, errors = read_sessions_csv(args.sessions, args.segments)
+    except (OSError, ValueError) as exc:
+        print(str(exc), file=sys.stderr)
+        return 2
+    for error in errors[:args.max_errors]:
+        print(error, file=sys.stderr)
+    if len(errors) > args.max_errors:
+        print(f"... and {len(errors) - args.max_errors} more invalid row(s)", file=sys.stderr)
+
+    if args.dry_run:
+        print(f"{len(sessions)} valid session(s), {len(errors)} invalid row(s); nothing written (--dry-run)")
+        return 1 if errors else 0
+
+    store = stats.create_store()
+    try:
+        result = stats.import_sessions(store, sessions)
+    finally:
+        store.close()
+    print(
+        f"Imported {result['added']} session(s) into {len(result['months'])} month(s); "
+        f"skipped {result['duplicates']} already stored and {len(errors)} invalid row(s)"
+    )
+    for year, month in result["failed"]:
+        print(f"{year:04d}-{month:02d}: month file could not be read; nothing imported for it", file=sys.stderr)
+    return 1 if errors or result["failed"] else 0
+
+
+def _cmd_archive(args):
+    """Compress closed months into YYYY-MM.json.gz archives and keep archiving them on app close."""
+    stats.set_auto_archive(True)
+    stats.compact_journals()
+    count = stats.archive_closed_months()
+    print(f"Archived {count} month(s) in {stats.get_stats_dir()}")
+    return 0
+
+
+def _cmd_unarchive(args):
+    """Expand every archived month back into plain JSON and stop the app re-archiving them."""
+    stats.set_auto_archive(False)
+    count = stats.unarchive_all_months()
+    print(f"Unarchived {count} month(s) in {stats.get_stats_dir()}")
+    return 0
+
+
+def _cmd_migrate(args):
+    """Upgrade every month file to the current schema in place."""
+    count = stats.migrate_stats_files()
+    print(f"Migrated {count} month(s) to schema version {stats.SCHEMA_VERSION} in {stats.get_stats_dir()}")
+    return 0
+
+
+def _cmd_aggregate(args):
+    """Roll up many users' stats folders per user and for the whole team."""
+    users = discover_user_stats_dirs(args.dirs)
+    if not users:
+        print("No stats month files found.", file=sys.stderr)
+        return 1
+
+    names = sorted(users)
+    if len(names) > 1 and args.workers != 1:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            results = pool.map(_aggregate_stats_dirs, [users[n] for n in names], [args.period] * len(names))
+            per_user = dict(zip(names, results))
+    else:
+        per_user = {name: _aggregate_stats_dirs(users[name], args.period) for name in names}
+
+    _write_rows(_rollup_rows(per_user), args.format, sys.stdout)
+    return 0
+
+
+def build_parser():
+    """Build the argument parser for the stats CLI."""
+    parser = argparse.ArgumentParser(
+        prog="python -m src.stats",
+        description="TrueFocus Timer stats tools.",
+    )
+    parser.add_argument(
+        "--stats-dir",
+        help="stats directory to use (defaults to the app's stats directory)",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    archive = subparsers.add_parser("archive", help="compress months before the current one")
+    archive.set_defaults(func=_cmd_archive)
+
+    unarchive = subparsers.add_parser("unarchive", help="expand archived months to plain JSON")
+    unarchive.set_defaults(func=_cmd_unarchive)
+
+    migrate = subparsers.add_parser("migrate", help="upgrade month files to the current schema")
+    migrate.set_defaults(func=_cmd_migrate)
+
+    aggregate = subparsers.add_parser(
+        "aggregate", help="per-user and team rollups over many users' stats folders"
+    )
+    aggregate.add_argument("dirs", nargs="+", help="stats folders, or folders containing one per user")
+    aggregate.add_argument("--period", choices=("day", "week"), default="day")
+    aggregate.add_argument("--format", choices=("table", "csv", "json"), default="table")
+    aggregate.add_argument("--workers", type=int, default=None, help="process pool size (default: CPU count)")
+    aggregate.set_defaults(func=_cmd_aggregate)
+
+    report = subparsers.add_parser(
+        "report", help="headline metrics and insights for a day, week, month or date range"
+    )
+    report.add_argument("period", nargs="?", choices=("day", "week", "month", "range"), default="day")
+    report.add_argument("--date", help="day inside the reported period, YYYY-MM-DD (default: today)")
+    report.add_argument("--from", dest="start", help="first day of a range, YYYY-MM-DD (inclusive)")
+    report.add_argument("--to", dest="end", help="last day of a range, YYYY-MM-DD (inclusive)")
+    report.add_argument("--format", choices=("text", "csv", "json"), default="text")
+    report.add_argument("--output", "-o", help="write the report to a file instead of stdout")
+    report.set_defaults(func=_cmd_report)
+
+    export = subparsers.add_parser(
+        "export", help="stream sessions and slack segments to flat CSV or Parquet tables"
+    )
+    export.add_argument("--format", choices=EXPORT_FORMATS, default="csv", help="parquet needs pyarrow")
+    export.add_argument("--output-dir", "-o", default=".", help="folder for sessions.* and slack_segments.*")
+    export.add_argument("--from", dest="start", help="first day to export, YYYY-MM-DD (inclusive)")
+    export.add_argument("--to", dest="end", help="last day to export, YYYY-MM-DD (inclusive)")
+    export.add_argument(
+        "--chunk-rows", type=int, default=STATS_EXPORT_CHUNK_ROWS, help="rows buffered per write"
+    )
+    export.set_defaults(func=_cmd_export)
+
+    import_ = subparsers.add_parser(
+        "import", help="bulk-add sessions from CSV (same columns as export), one write per month"
+    )
+    import_.add_argument("sessions", help="sessions CSV: start_time, end_time, initial_productivity_time, ...")
+    import_.add_argument("--segments", help="slack_segments CSV joined on session_start_time")
+    import_.add_argument("--dry-run", action="store_true", help="validate only; write nothing")
+    import_.add_argument("--max-errors", type=int, default=20, help="invalid rows to list (default: 20)")
+    import_.set_defaults(func=_cmd_import)
+
+    return parser
+
+
+def main(argv=None):
+    """Run the stats CLI and return a process exit code."""
+    args = build_parser().parse_args(argv)
+    if args.stats_dir:
+        stats.set_stats_dir(args.stats_dir)
+    return args.func(args)
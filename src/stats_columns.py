@@ -0,0 +1,174 @@
+"""Columnar session table for vectorized stats aggregations."""
+
+from datetime import date
+
+from src.stats_records import OUTCOME_CODES
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+OUTCOME_UNKNOWN = -1
+
+PERIODS = ("day", "week", "month")
+
+
+def _period_keys(day_ordinals, period):
+    """Map day ordinals to period keys (day ordinal, Monday ordinal or YYYY-MM-01 ordinal)."""
+    if period == "day":
+        return day_ordinals
+    if period == "week":
+        # date.toordinal() of a Monday is congruent to 1 mod 7.
+        return [o - (o - 1) % 7 for o in day_ordinals] if np is None else day_ordinals - (day_ordinals - 1) % 7
+    if period == "month":
+        keys = [date.fromordinal(int(o)).replace(day=1).toordinal() for o in day_ordinals]
+        return keys if np is None else np.asarray(keys, dtype=np.int64)
+    raise ValueError(f"unknown period: {period}")
+
+
+class SessionColumns:
+    """Column-oriented view of sessions.
+
+    Columns are NumPy arrays when NumPy is installed and plain lists otherwise;
+    every aggregation has a pure-Python fallback with identical results.
+    """
+
+    def __init__(self, sessions):
+        from src.stats import add_session_timestamps, compute_session_metrics, session_day_ordinal
+
+        start_times = []
+        start_epoch = []
+        day_ordinal = []
+        planned = []
+        slack = []
+        actual = []
+        outcome = []
+        slack_events = []
+        longest_segment = []
+        for session in sessions:
+            if session.get("start_ts") is None:
+                session = add_session_timestamps(dict(session))
+            start_ts = session.get("start_ts")
+            if start_ts is None:
+                continue
+            metrics = compute_session_metrics(session)
+            durations = [
+                seg.get("duration_seconds") for seg in session.get("slack_segments", [])
+                if seg.get("duration_seconds") is not None
+            ]
+            start_times.append(session["start_time"])
+            start_epoch.append(start_ts)
+            day_ordinal.append(session_day_ordinal(session))
+            planned.append(session.get("initial_productivity_time", 0))
+            slack.append(session.get("total_slack_time", 0))
+            actual.append(metrics["actual_focus_time"])
+            outcome.append(OUTCOME_CODES.get(session.get("outcome"), OUTCOME_UNKNOWN))
+            slack_events.append(session.get("slack_events_count", 0))
+            longest_segment.append(max(durations) if durations else -1)
+
+        self.start_times = start_times
+        if np is not None:
+            self.start_epoch = np.asarray(start_epoch, dtype=np.int64)
+            self.day_ordinal = np.asarray(day_ordinal, dtype=np.int64)
+            self.planned = np.asarray(planned, dtype=np.int64)
+            self.slack = np.asarray(slack, dtype=np.int64)
+            self.actual = np.asarray(actual, dtype=np.int64)
+            self.outcome = np.asarray(outcome, dtype=np.int8)
+            self.slack_events = np.asarray(slack_events, dtype=np.int64)
+            self.longest_segment = np.asarray(longest_segment, dtype=np.int64)
+        else:
+            self.start_epoch = start_epoch
+            self.day_ordinal = day_ordinal
+            self.planned = planned
+            self.slack = slack
+            self.actual = actual
+            self.outcome = outcome
+            self.slack_events = slack_events
+            self.longest_segment = longest_segment
+
+    def __len__(self):
+        return len(self.start_times)
+
+    def _indices(self, start=None, end=None):
+        """Return the row selection for dates in [start, end] (inclusive)."""
+        lo = start.toordinal() if start else None
+        hi = end.toordinal() if end else None
+        if np is not None:
+            mask = np.ones(len(self), dtype=bool)
+            if lo is not None:
+                mask &= self.day_ordinal >= lo
+            if hi is not None:
+                mask &= self.day_ordinal <= hi
+            return np.flatnonzero(mask)
+        return [
+            i for i, o in enumerate(self.day_ordinal)
+            if (lo is None or o >= lo) and (hi is None or o <= hi)
+        ]
+
+    def totals_by(self, period="day", start=None, end=None):
+        """Return {period start date: totals} for sessions between start and end dates."""
+        idx = self._indices(start, end)
+        totals = {}
+        if np is not None:
+            if len(idx) == 0:
+                return totals
+            keys, inverse = np.unique(_period_keys(self.day_ordinal[idx], period), return_inverse=True)
+            columns = {
+                "planned": np.bincount(inverse, weights=self.planned[idx]),
+                "actual": np.bincount(inverse, weights=self.actual[idx]),
+                "slack": np.bincount(inverse, weights=self.slack[idx]),
+                "slack_events": np.bincount(inverse, weights=self.slack_events[idx]),
+                "completed": np.bincount(inverse, weights=(self.outcome[idx] == OUTCOME_CODES["completed"])),
+                "reset_early": np.bincount(inverse, weights=(self.outcome[idx] == OUTCOME_CODES["reset_early"])),
+            }
+            counts = np.bincount(inverse)
+            for pos, key in enumerate(keys):
+                row = {"sessions": int(counts[pos])}
+                row.update({name: int(values[pos]) for name, values in columns.items()})
+                totals[date.fromordinal(int(key))] = row
+            return totals
+
+        keys = _period_keys([self.day_ordinal[i] for i in idx], period)
+        for i, key in zip(idx, keys):
+            row = totals.setdefault(date.fromordinal(key), {
+                "sessions": 0, "planned": 0, "actual": 0, "slack": 0,
+                "slack_events": 0, "completed": 0, "reset_early": 0,
+            })
+            row["sessions"] += 1
+            row["planned"] += self.planned[i]
+            row["actual"] += self.actual[i]
+            row["slack"] += self.slack[i]
+            row["slack_events"] += self.slack_events[i]
+            row["completed"] += self.outcome[i] == OUTCOME_CODES["completed"]
+            row["reset_early"] += self.outcome[i] == OUTCOME_CODES["reset_early"]
+        return dict(sorted(totals.items()))
+
+    def most_disrupted(self, start=None, end=None):
+        """Return (start_time, slack_ratio) of the session with the highest slack ratio."""
+        idx = self._indices(start, end)
+        if len(idx) == 0:
+            return None, 0
+        if np is not None:
+            denom = self.actual[idx] + self.slack[idx]
+            ratios = np.divide(self.slack[idx], denom, out=np.zeros(len(idx)), where=denom > 0)
+            best = int(np.argmax(ratios))
+            return self.start_times[idx[best]], float(ratios[best])
+        best_i, best_ratio = None, -1
+        for i in idx:
+            denom = self.actual[i] + self.slack[i]
+            ratio = (self.slack[i] / denom) if denom else 0
+            if ratio > best_ratio:
+                best_i, best_ratio = i, ratio
+        return self.start_times[best_i], best_ratio
+
+    def longest_interruption(self, start=None, end=None):
+        """Return the longest slack segment in seconds, or None if there were none."""
+        idx = self._indices(start, end)
+        if len(idx) == 0:
+            return None
+        if np is not None:
+            longest = int(self.longest_segment[idx].max())
+        else:
+            longest = max(self.longest_segment[i] for i in idx)
+        return longest if longest >= 0 else None
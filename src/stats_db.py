@@ -0,0 +1,358 @@
+"""SQLite-backed session store for TrueFocus Timer."""
+
+import os
+import json
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from src.debug_log import get_debug_logger
+
+_logger = get_debug_logger("truefocus.stats_db")
+
+DB_FILENAME = "sessions.db"
+SCHEMA_VERSION = 2
+
+# Session keys stored in dedicated columns; anything else goes to the "extra" JSON blob.
+_SESSION_COLUMNS = (
+    "start_time",
+    "end_time",
+    "start_ts",
+    "end_ts",
+    "utc_offset",
+    "initial_productivity_time",
+    "total_slack_time",
+    "work_time_actual",
+    "slack_events_count",
+    "outcome",
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    start_time TEXT NOT NULL UNIQUE,  -- UNIQUE also provides the start time index
+    end_time TEXT,
+    start_ts INTEGER,
+    end_ts INTEGER,
+    utc_offset INTEGER,
+    initial_productivity_time INTEGER NOT NULL DEFAULT 0,
+    total_slack_time INTEGER NOT NULL DEFAULT 0,
+    work_time_actual INTEGER NOT NULL DEFAULT 0,
+    slack_events_count INTEGER NOT NULL DEFAULT 0,
+    outcome TEXT,
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_outcome ON sessions (outcome, start_time);
+CREATE TABLE IF NOT EXISTS slack_segments (
+    session_id INTEGER NOT NULL REFERENCES sessions (id) ON DELETE CASCADE,
+    seq INTEGER NOT NULL,
+    start_time TEXT,
+    end_time TEXT,
+    duration_seconds INTEGER,
+    start_ts INTEGER,
+    end_ts INTEGER,
+    PRIMARY KEY (session_id, seq)
+);
+CREATE INDEX IF NOT EXISTS idx_slack_segments_start ON slack_segments (start_time);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# Statements that upgrade a database from the previous user_version.
+_MIGRATIONS = {
+    2: (
+        "ALTER TABLE sessions ADD COLUMN start_ts INTEGER",
+        "ALTER TABLE sessions ADD COLUMN end_ts INTEGER",
+        "ALTER TABLE sessions ADD COLUMN utc_offset INTEGER",
+        "ALTER TABLE slack_segments ADD COLUMN start_ts INTEGER",
+        "ALTER TABLE slack_segments ADD COLUMN end_ts INTEGER",
+    ),
+}
+
+
+def get_db_path(stats_dir=None):
+    """Get the SQLite database path inside the stats directory."""
+    if stats_dir is None:
+        from src.stats import get_stats_dir
+        stats_dir = get_stats_dir()
+    return os.path.join(stats_dir, DB_FILENAME)
+
+
+class SqliteStore:
+    """Stores sessions and slack segments in an indexed SQLite database (WAL mode)."""
+
+    supports_queries = True
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path or get_db_path()
+        # The connection is shared with background threads; access is serialized by _lock.
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version and version < SCHEMA_VERSION:
+            self._migrate(version)
+        with self._conn:
+            self._conn.executescript(_SCHEMA)
+            self._conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        if self._get_meta("json_imported") is None:
+            self.import_month_files()
+
+    def _migrate(self, version):
+        """Upgrade an older database in place, backfilling epoch timestamps."""
+        from src.stats import iso_epoch
+
+        with self._conn:
+            for target in range(version + 1, SCHEMA_VERSION + 1):
+                for statement in _MIGRATIONS.get(target, ()):
+                    self._conn.execute(statement)
+            rows = self._conn.execute("SELECT id, start_time, end_time FROM sessions WHERE start_ts IS NULL").fetchall()
+            self._conn.executemany(
+                "UPDATE sessions SET start_ts = ?, utc_offset = ?, end_ts = ? WHERE id = ?",
+                [(*iso_epoch(row["start_time"]), iso_epoch(row["end_time"])[0], row["id"]) for row in rows],
+            )
+            segments = self._conn.execute(
+                "SELECT session_id, seq, start_time, end_time FROM slack_segments WHERE start_ts IS NULL"
+            ).fetchall()
+            self._conn.executemany(
+                "UPDATE slack_segments SET start_ts = ?, end_ts = ? WHERE session_id = ? AND seq = ?",
+                [
+                    (iso_epoch(seg["start_time"])[0], iso_epoch(seg["end_time"])[0], seg["session_id"], seg["seq"])
+                    for seg in segments
+                ],
+            )
+        _logger.info("sqlite-migrated from=%d to=%d sessions=%d", version, SCHEMA_VERSION, len(rows))
+
+    def _get_meta(self, key):
+        """Read a value from the meta table."""
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row else None
+
+    def _insert_session(self, session):
+        """Insert one session and its segments; return False if it already exists."""
+        from src.stats import add_session_timestamps
+
+        if "start_ts" not in session:
+            session = add_session_timestamps(dict(session))
+        extra = {k: v for k, v in session.items() if k not in _SESSION_COLUMNS and k != "slack_segments"}
+        cursor = self._conn.execute(
+            "INSERT OR IGNORE INTO sessions (start_time, end_time, start_ts, end_ts, utc_offset,"
+            " initial_productivity_time, total_slack_time, work_time_actual, slack_events_count, outcome, extra)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                session.get("start_time"),
+                session.get("end_time"),
+                session.get("start_ts"),
+                session.get("end_ts"),
+                session.get("utc_offset"),
+                session.get("initial_productivity_time", 0),
+                session.get("total_slack_time", 0),
+                session.get("work_time_actual", 0),
+                session.get("slack_events_count", 0),
+                session.get("outcome"),
+                json.dumps(extra) if extra else None,
+            ),
+        )
+        if cursor.rowcount == 0:
+            return False
+        session_id = cursor.lastrowid
+        self._conn.executemany(
+            "INSERT INTO slack_segments (session_id, seq, start_time, end_time, duration_seconds, start_ts, end_ts)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    session_id, seq, seg.get("start_time"), seg.get("end_time"), seg.get("duration_seconds"),
+                    seg.get("start_ts"), seg.get("end_ts"),
+                )
+                for seq, seg in enumerate(session.get("slack_segments", []))
+            ],
+        )
+        return True
+
+    def _rows_to_sessions(self, rows):
+        """Rebuild session dicts (including slack segments) from session rows."""
+        sessions = []
+        by_id = {}
+        for row in rows:
+            session = {key: row[key] for key in _SESSION_COLUMNS}
+            if row["extra"]:
+                session.update(json.loads(row["extra"]))
+            session["slack_segments"] = []
+            by_id[row["id"]] = session
+            sessions.append(session)
+        if by_id:
+            ids = list(by_id)
+            # Chunk the IN clause to stay under SQLite's bound-parameter limit.
+            for offset in range(0, len(ids), 500):
+                chunk = ids[offset:offset + 500]
+                placeholders = ",".join("?" * len(chunk))
+                for seg in self._conn.execute(
+                    f"SELECT session_id, start_time, end_time, duration_seconds, start_ts, end_ts FROM slack_segments"
+                    f" WHERE session_id IN ({placeholders}) ORDER BY session_id, seq",
+                    chunk,
+                ):
+                    by_id[seg["session_id"]]["slack_segments"].append({
+                        "start_time": seg["start_time"],
+                        "end_time": seg["end_time"],
+                        "duration_seconds": seg["duration_seconds"],
+                        "start_ts": seg["start_ts"],
+                        "end_ts": seg["end_ts"],
+                    })
+        return sessions
+
+    def _query_sessions(self, where="", params=()):
+        """Return session dicts matching an optional WHERE clause, ordered by start time."""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT * FROM sessions {where} ORDER BY start_time", params
+            ).fetchall()
+            return self._rows_to_sessions(rows)
+
+    def import_month_files(self):
+        """One-shot import of existing YYYY-MM.json month files (and journals)."""
+        from src.stats import list_stats_months, load_month_sessions
+
+        imported = 0
+        with self._lock, self._conn:
+            for year, month in list_stats_months():
+                for session in load_month_sessions(year, month):
+                    if session.get("start_time") and self._insert_session(session):
+                        imported += 1
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('json_imported', ?)",
+                (datetime.now().isoformat(),),
+            )
+        _logger.info("sqlite-import-done sessions=%d", imported)
+        return imported
+
+    def load_all(self):
+        """Load every stored session."""
+        return self._query_sessions()
+
+    def load_month(self, year, month):
+        """Load sessions that started in the given month."""
+        start = datetime(year, month, 1)
+        end = datetime(year + (month == 12), month % 12 + 1, 1)
+        return self.sessions_between(start, end)
+
+    def list_months(self):
+        """Return sorted (year, month) pairs that have stored sessions."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT substr(start_time, 1, 7) AS month FROM sessions ORDER BY month"
+            ).fetchall()
+        months = []
+        for row in rows:
+            try:
+                months.append((int(row["month"][:4]), int(row["month"][5:7])))
+            except (TypeError, ValueError):
+                continue
+        return months
+
+    def month_signature(self, year, month):
+        """Return a cheap fingerprint (count, latest start) of a month's sessions."""
+        start = datetime(year, month, 1)
+        end = datetime(year + (month == 12), month % 12 + 1, 1)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) AS n, MAX(start_time) AS last FROM sessions"
+                " WHERE start_time >= ? AND start_time < ?",
+                (start.isoformat(), end.isoformat()),
+            ).fetchone()
+        return [row["n"], row["last"]]
+
+    def save_session(self, session):
+        """Persist one finished session in a single transaction."""
+        self.save_sessions([session])
+
+    def save_sessions(self, sessions):
+        """Persist a batch of finished sessions in a single transaction."""
+        try:
+            with self._lock, self._conn:
+                for session in sessions:
+                    self._insert_session(session)
+        except Exception:
+            _logger.exception("sqlite-save-error sessions=%d", len(sessions))
+
+    def import_month(self, year, month, sessions):
+        """Insert a batch of sessions for one month in a single transaction; raises on failure."""
+        with self._lock, self._conn:
+            for session in sessions:
+                self._insert_session(session)
+
+    def sessions_between(self, start, end):
+        """Return sessions whose start time falls in [start, end)."""
+        return self._query_sessions(
+            "WHERE start_time >= ? AND start_time < ?",
+            (start.isoformat(), end.isoformat()),
+        )
+
+    def iter_sessions(self, start=None, end=None, batch_size=500):
+        """Stream sessions whose start time falls in [start, end), a batch of rows at a time."""
+        clauses = []
+        params = []
+        if start is not None:
+            clauses.append("start_time >= ?")
+            params.append(start.isoformat())
+        if end is not None:
+            clauses.append("start_time < ?")
+            params.append(end.isoformat())
+        where = ("WHERE " + " AND ".join(clauses)) if clauses else ""
+        last_key = None
+        while True:
+            # Keyset pagination keeps each batch an indexed range scan.
+            batch_where = where
+            batch_params = list(params)
+            if last_key is not None:
+                batch_where += (" AND " if batch_where else "WHERE ") + "start_time > ?"
+                batch_params.append(last_key)
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT * FROM sessions {batch_where} ORDER BY start_time LIMIT ?",
+                    batch_params + [batch_size],
+                ).fetchall()
+                sessions = self._rows_to_sessions(rows)
+            if not sessions:
+                return
+            yield from sessions
+            last_key = sessions[-1]["start_time"]
+
+    def sessions_on(self, day):
+        """Return sessions that started on the given local date."""
+        start = datetime(day.year, day.month, day.day)
+        return self.sessions_between(start, start + timedelta(days=1))
+
+    def day_counts(self, year, month):
+        """Return {date: session_count} for the given month."""
+        start = datetime(year, month, 1)
+        end = datetime(year + (month == 12), month % 12 + 1, 1)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT substr(start_time, 1, 10) AS day, COUNT(*) AS n FROM sessions"
+                " WHERE start_time >= ? AND start_time < ? GROUP BY day",
+                (start.isoformat(), end.isoformat()),
+            ).fetchall()
+        counts = {}
+        for row in rows:
+            try:
+                counts[datetime.strptime(row["day"], "%Y-%m-%d").date()] = row["n"]
+            except ValueError:
+                continue
+        return counts
+
+    def compact(self):
+        """Checkpoint the WAL back into the main database file."""
+        try:
+            with self._lock:
+                self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        except Exception:
+            _logger.exception("sqlite-checkpoint-error")
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
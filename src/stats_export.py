@@ -0,0 +1,179 @@
+"""Flat table export of sessions and slack segments for external analytics.
+
+Sessions become one row each (with the derived metrics from
+compute_session_metrics) and their slack segments a second table keyed by
+the session's start_time. Rows are written in chunks, so memory stays
+bounded by the chunk size rather than the history length. CSV needs only
+the stdlib; Parquet needs pyarrow and writes one row group per chunk.
+"""
+
+import csv
+import os
+
+from src.config import STATS_EXPORT_CHUNK_ROWS
+from src.stats import compute_session_metrics
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+EXPORT_FORMATS = ("csv", "parquet")
+
+# (column, type) pairs; types are "str", "int" or "float".
+SESSION_COLUMNS = (
+    ("start_time", "str"),
+    ("end_time", "str"),
+    ("start_ts", "int"),
+    ("end_ts", "int"),
+    ("utc_offset", "int"),
+    ("outcome", "str"),
+    ("initial_productivity_time", "int"),
+    ("total_slack_time", "int"),
+    ("work_time_actual", "int"),
+    ("slack_events_count", "int"),
+    ("project", "str"),
+    ("tags", "str"),
+    ("slack_segment_count", "int"),
+    ("wall_clock_duration", "int"),
+    ("actual_focus_time", "int"),
+    ("slack_ratio", "float"),
+    ("overrun_time", "int"),
+)
+SEGMENT_COLUMNS = (
+    ("session_start_time", "str"),
+    ("seq", "int"),
+    ("start_time", "str"),
+    ("end_time", "str"),
+    ("start_ts", "int"),
+    ("end_ts", "int"),
+    ("duration_seconds", "int"),
+)
+
+# Session columns copied as stored (tags are joined with commas); the rest are derived in session_rows().
+_STORED_SESSION_FIELDS = tuple(name for name, _ in SESSION_COLUMNS[:11])
+
+
+def session_rows(session):
+    """Return (session row, [segment rows]) for one session; rows are tuples in column order."""
+    metrics = compute_session_metrics(session)
+    segments = session.get("slack_segments") or []
+    tags = session.get("tags")
+    row = tuple(session.get(field) for field in _STORED_SESSION_FIELDS) + (
+        ",".join(tags) if tags else None,
+        len(segments),
+        metrics["wall_clock_duration"],
+        metrics["actual_focus_time"],
+        metrics["slack_ratio"],
+        metrics["overrun_time"],
+    )
+    start_time = session.get("start_time")
+    segment_rows = [
+        (
+            start_time,
+            seq,
+            seg.get("start_time"),
+            seg.get("end_time"),
+            seg.get("start_ts"),
+            seg.get("end_ts"),
+            seg.get("duration_seconds"),
+        )
+        for seq, seg in enumerate(segments)
+    ]
+    return row, segment_rows
+
+
+class CsvTableWriter:
+    """Appends row chunks to a CSV file with a header row."""
+
+    def __init__(self, path, columns):
+        self._file = open(path, "w", encoding="utf-8", newline="")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow([name for name, _ in columns])
+
+    def write_rows(self, rows):
+        """Append a chunk of row tuples."""
+        self._writer.writerows(rows)
+
+    def close(self):
+        """Close the file."""
+        self._file.close()
+
+
+class ParquetTableWriter:
+    """Appends row chunks to a Parquet file, one row group per chunk."""
+
+    _ARROW_TYPES = {"str": "string", "int": "int64", "float": "float64"}
+
+    def __init__(self, path, columns):
+        if pa is None:
+            raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow)")
+        self._names = [name for name, _ in columns]
+        self._schema = pa.schema([(name, getattr(pa, self._ARROW_TYPES[kind])()) for name, kind in columns])
+        self._writer = pq.ParquetWriter(path, self._schema)
+
+    def write_rows(self, rows):
+        """Append a chunk of row tuples as one row group."""
+        columns = {name: list(values) for name, values in zip(self._names, zip(*rows))}
+        self._writer.write_table(pa.Table.from_pydict(columns, schema=self._schema))
+
+    def close(self):
+        """Write the footer and close the file."""
+        self._writer.close()
+
+
+_WRITERS = {"csv": CsvTableWriter, "parquet": ParquetTableWriter}
+
+
+def export_tables(sessions, out_dir, fmt="csv", chunk_rows=STATS_EXPORT_CHUNK_ROWS):
+    """Stream sessions into sessions.<fmt> and slack_segments.<fmt> under out_dir.
+
+    Returns {"sessions": path, "slack_segments": path, "session_rows": n, "segment_rows": n}.
+    """
+    if fmt not in _WRITERS:
+        raise ValueError(f"unknown export format: {fmt}")
+    os.makedirs(out_dir, exist_ok=True)
+    session_path = os.path.join(out_dir, f"sessions.{fmt}")
+    segment_path = os.path.join(out_dir, f"slack_segments.{fmt}")
+    session_writer = _WRITERS[fmt](session_path, SESSION_COLUMNS)
+    try:
+        segment_writer = _WRITERS[fmt](segment_path, SEGMENT_COLUMNS)
+    except Exception:
+        session_writer.close()
+        raise
+
+    session_chunk = []
+    segment_chunk = []
+    session_count = 0
+    segment_count = 0
+    try:
+        for session in sessions:
+            row, segment_rows = session_rows(session)
+            session_chunk.append(row)
+            segment_chunk.extend(segment_rows)
+            if len(session_chunk) >= chunk_rows:
+                session_writer.write_rows(session_chunk)
+                session_count += len(session_chunk)
+                session_chunk = []
+            if len(segment_chunk) >= chunk_rows:
+                segment_writer.write_rows(segment_chunk)
+                segment_count += len(segment_chunk)
+                segment_chunk = []
+        if session_chunk:
+            session_writer.write_rows(session_chunk)
+            session_count += len(session_chunk)
+        if segment_chunk:
+            segment_writer.write_rows(segment_chunk)
+            segment_count += len(segment_chunk)
+    finally:
+        session_writer.close()
+        segment_writer.close()
+
+    return {
+        "sessions": session_path,
+        "slack_segments": segment_path,
+        "session_rows": session_count,
+        "segment_rows": segment_count,
+    }
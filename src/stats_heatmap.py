@@ -0,0 +1,81 @@
+"""Weekday x hour-of-day slack and focus heatmap for TrueFocus Timer stats.
+
+Cells are numbered weekday * 24 + hour (Monday = 0), all in the session's
+local time. Per-day rollups keep a sparse {cell: [slack, focus]} mapping;
+the all-time matrix is two fixed 168-element lists.
+"""
+
+HEATMAP_CELLS = 7 * 24
+WEEKDAY_LABELS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+
+_EPOCH_WEEKDAY = 3  # 1970-01-01 was a Thursday.
+
+
+def heat_cell(local_seconds):
+    """Return the weekday * 24 + hour cell for local seconds since the epoch."""
+    days, rest = divmod(local_seconds, 86400)
+    return (days + _EPOCH_WEEKDAY) % 7 * 24 + rest // 3600
+
+
+def split_by_hour(start, end):
+    """Yield (cell, seconds) for the local-seconds interval [start, end), split at hour boundaries."""
+    while start < end:
+        boundary = min((start // 3600 + 1) * 3600, end)
+        yield heat_cell(start), boundary - start
+        start = boundary
+
+
+def session_heat_cells(session):
+    """Return {cell: [slack_seconds, focus_seconds]} for one finished session.
+
+    Slack is each slack segment's span; focus is the rest of the session's
+    wall-clock span in the same hour.
+    """
+    start_ts = session.get("start_ts")
+    end_ts = session.get("end_ts")
+    if start_ts is None or end_ts is None:
+        return {}
+    offset = session.get("utc_offset") or 0
+    cells = {}
+    for cell, seconds in split_by_hour(start_ts + offset, end_ts + offset):
+        cells[cell] = [0, seconds]
+    for seg in session.get("slack_segments", []):
+        seg_start = seg.get("start_ts")
+        seg_end = seg.get("end_ts")
+        if seg_start is None or seg_end is None:
+            continue
+        for cell, seconds in split_by_hour(seg_start + offset, seg_end + offset):
+            slack_focus = cells.setdefault(cell, [0, 0])
+            slack_focus[0] += seconds
+            slack_focus[1] = max(slack_focus[1] - seconds, 0)
+    return cells
+
+
+def add_heat(heat, cells):
+    """Add {cell: [slack, focus]} into a sparse per-day heat mapping keyed by str(cell)."""
+    for cell, (slack, focus) in cells.items():
+        slack_focus = heat.setdefault(str(cell), [0, 0])
+        slack_focus[0] += slack
+        slack_focus[1] += focus
+
+
+class WeekHourHeatmap:
+    """All-time weekday x hour matrix of slack and focus seconds (168 cells each)."""
+
+    __slots__ = ("slack", "focus")
+
+    def __init__(self):
+        self.slack = [0] * HEATMAP_CELLS
+        self.focus = [0] * HEATMAP_CELLS
+
+    def add(self, heat):
+        """Add a sparse {cell: [slack, focus]} mapping (int or str cell keys)."""
+        for cell, (slack, focus) in heat.items():
+            cell = int(cell)
+            self.slack[cell] += slack
+            self.focus[cell] += focus
+
+    def rows(self, field="slack"):
+        """Return the 7 x 24 rows (Monday first) of one field."""
+        values = self.slack if field == "slack" else self.focus
+        return [values[day * 24:(day + 1) * 24] for day in range(7)]
@@ -0,0 +1,139 @@
+"""Bulk CSV import of sessions (e.g. history from another time tracker).
+
+The sessions CSV needs start_time, end_time (ISO 8601) and
+initial_productivity_time (seconds); total_slack_time, slack_events_count,
+work_time_actual, outcome, project and tags (comma-separated) are
+optional. Files written by ``python -m src.stats export`` are accepted
+as-is, including an optional slack_segments CSV joined on
+session_start_time. Derived columns such as actual_focus_time are ignored
+and recomputed from the stored fields.
+"""
+
+import csv
+from datetime import datetime
+
+from src.stats import add_session_timestamps, normalize_labels
+from src.stats_records import OUTCOME_CODES
+
+REQUIRED_COLUMNS = ("start_time", "end_time", "initial_productivity_time")
+REQUIRED_SEGMENT_COLUMNS = ("session_start_time", "start_time", "end_time")
+
+
+def _parse_time(row, column):
+    """Return (normalized ISO string, datetime) for a required timestamp column."""
+    value = (row.get(column) or "").strip()
+    if not value:
+        raise ValueError(f"{column} is missing")
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"{column} is not an ISO timestamp: {value!r}") from None
+    return parsed.isoformat(), parsed
+
+
+def _parse_seconds(row, column, default=None):
+    """Return a non-negative whole number of seconds from a column (default when blank)."""
+    value = (row.get(column) or "").strip()
+    if not value:
+        if default is None:
+            raise ValueError(f"{column} is missing")
+        return default
+    try:
+        seconds = int(float(value))
+    except ValueError:
+        raise ValueError(f"{column} is not a number: {value!r}") from None
+    if seconds < 0:
+        raise ValueError(f"{column} is negative")
+    return seconds
+
+
+def _check_columns(reader, required, path):
+    """Raise ValueError if the CSV header lacks a required column."""
+    missing = [column for column in required if column not in (reader.fieldnames or ())]
+    if missing:
+        raise ValueError(f"{path}: missing column(s) {', '.join(missing)}")
+
+
+def parse_session_row(row):
+    """Validate one sessions CSV row and return a session dict (without slack segments)."""
+    start_time, start_dt = _parse_time(row, "start_time")
+    end_time, end_dt = _parse_time(row, "end_time")
+    if (start_dt.tzinfo is None) != (end_dt.tzinfo is None):
+        raise ValueError("start_time and end_time mix local and UTC-offset timestamps")
+    if end_dt < start_dt:
+        raise ValueError("end_time is before start_time")
+    initial = _parse_seconds(row, "initial_productivity_time")
+    slack = _parse_seconds(row, "total_slack_time", 0)
+    outcome = (row.get("outcome") or "").strip() or "completed"
+    if outcome not in OUTCOME_CODES:
+        raise ValueError(f"unknown outcome {outcome!r}")
+    project, tags = normalize_labels(row.get("project"), row.get("tags") or "")
+    return {
+        "start_time": start_time,
+        "end_time": end_time,
+        "initial_productivity_time": initial,
+        "total_slack_time": slack,
+        "work_time_actual": _parse_seconds(row, "work_time_actual", max(initial - slack, 0)),
+        "slack_events_count": _parse_seconds(row, "slack_events_count", 0),
+        "slack_segments": [],
+        "outcome": outcome,
+        "project": project,
+        "tags": tags,
+    }
+
+
+def parse_segment_row(row):
+    """Validate one slack_segments CSV row and return (session_start_time, seq, segment dict)."""
+    session_start, _ = _parse_time(row, "session_start_time")
+    start_time, start_dt = _parse_time(row, "start_time")
+    end_time, end_dt = _parse_time(row, "end_time")
+    if end_dt < start_dt:
+        raise ValueError("end_time is before start_time")
+    duration = _parse_seconds(row, "duration_seconds", int((end_dt - start_dt).total_seconds()))
+    seq = _parse_seconds(row, "seq", 0)
+    return session_start, seq, {"start_time": start_time, "end_time": end_time, "duration_seconds": duration}
+
+
+def read_sessions_csv(path, segments_path=None):
+    """Read and validate sessions (plus optional slack segments) from CSV files.
+
+    Returns (sessions, errors): invalid rows are left out and reported as
+    "file:line: message" strings. Raises ValueError if a required column is
+    missing from a header.
+    """
+    sessions = {}
+    errors = []
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        reader = csv.DictReader(f)
+        _check_columns(reader, REQUIRED_COLUMNS, path)
+        for row in reader:
+            try:
+                session = parse_session_row(row)
+            except ValueError as exc:
+                errors.append(f"{path}:{reader.line_num}: {exc}")
+                continue
+            if session["start_time"] in sessions:
+                errors.append(f"{path}:{reader.line_num}: duplicate start_time {session['start_time']}")
+                continue
+            sessions[session["start_time"]] = session
+
+    if segments_path:
+        segments = {}
+        with open(segments_path, "r", encoding="utf-8-sig", newline="") as f:
+            reader = csv.DictReader(f)
+            _check_columns(reader, REQUIRED_SEGMENT_COLUMNS, segments_path)
+            for row in reader:
+                try:
+                    session_start, seq, segment = parse_segment_row(row)
+                except ValueError as exc:
+                    errors.append(f"{segments_path}:{reader.line_num}: {exc}")
+                    continue
+                if session_start not in sessions:
+                    errors.append(f"{segments_path}:{reader.line_num}: no session starts at {session_start}")
+                    continue
+                segments.setdefault(session_start, []).append((seq, segment))
+        for session_start, numbered in segments.items():
+            numbered.sort(key=lambda item: item[0])
+            sessions[session_start]["slack_segments"] = [segment for _, segment in numbered]
+
+    return [add_session_timestamps(session) for session in sessions.values()], errors
@@ -0,0 +1,245 @@
+"""In-memory indexes over session history for TrueFocus Timer stats."""
+
+from bisect import bisect_left, bisect_right
+
+
+class DateIndex:
+    """Sessions kept sorted by ISO start time for O(log n + k) date lookups.
+
+    ISO timestamps sort chronologically as strings, so lookups bisect on the
+    raw start_time values without parsing any datetimes.
+    """
+
+    def __init__(self, sessions=()):
+        pairs = sorted(
+            ((s["start_time"], i, s) for i, s in enumerate(sessions) if s.get("start_time")),
+            key=lambda pair: (pair[0], pair[1]),
+        )
+        self._keys = [key for key, _, _ in pairs]
+        self._sessions = [session for _, _, session in pairs]
+
+    def __len__(self):
+        return len(self._keys)
+
+    def add(self, session):
+        """Insert a session at its chronological position."""
+        key = session.get("start_time")
+        if not key:
+            return
+        if not self._keys or key >= self._keys[-1]:
+            # Fast path: new sessions almost always come last.
+            self._keys.append(key)
+            self._sessions.append(session)
+            return
+        pos = bisect_right(self._keys, key)
+        self._keys.insert(pos, key)
+        self._sessions.insert(pos, session)
+
+    def between(self, start_key, end_key):
+        """Return sessions whose start time key falls in [start_key, end_key)."""
+        lo = bisect_left(self._keys, start_key)
+        hi = bisect_left(self._keys, end_key, lo)
+        return self._sessions[lo:hi]
+
+
+class DayRangeTotals:
+    """Fenwick (binary indexed) trees of per-day totals keyed by date ordinal.
+
+    add() and totals() cost O(log days). Raw daily values are kept alongside
+    the trees so the covered span can be widened (doubling to the right for
+    future days) by an O(days) rebuild.
+    """
+
+    def __init__(self, fields, daily=None):
+        self.fields = tuple(fields)
+        self._first = None
+        self._values = [[] for _ in self.fields]
+        self._trees = [[0] for _ in self.fields]
+        if daily:
+            first = min(daily)
+            self._rebuild(first, max(daily) - first + 1, daily)
+
+    def __len__(self):
+        return len(self._values[0])
+
+    def _daily(self):
+        """Return {ordinal: values} for every day with non-zero totals."""
+        daily = {}
+        for offset in range(len(self)):
+            values = [column[offset] for column in self._values]
+            if any(values):
+                daily[self._first + offset] = values
+        return daily
+
+    def _rebuild(self, first, size, daily):
+        """Lay out raw values for [first, first + size) and build the trees in O(size)."""
+        self._first = first
+        self._values = [[0] * size for _ in self.fields]
+        for ordinal, values in daily.items():
+            for column, value in zip(self._values, values):
+                column[ordinal - first] += value
+        self._trees = []
+        for column in self._values:
+            tree = [0] + column
+            for i in range(1, size + 1):
+                parent = i + (i & -i)
+                if parent <= size:
+                    tree[parent] += tree[i]
+            self._trees.append(tree)
+
+    def add(self, ordinal, values):
+        """Add one day's worth of values (in field order) to the totals."""
+        size = len(self)
+        if self._first is None:
+            self._rebuild(ordinal, 1, {})
+            size = 1
+        elif ordinal < self._first:
+            # Backfilled history: widen to the left only as far as needed.
+            self._rebuild(ordinal, self._first + size - ordinal, self._daily())
+            size = len(self)
+        elif ordinal >= self._first + size:
+            self._rebuild(self._first, max(ordinal - self._first + 1, 2 * size), self._daily())
+            size = len(self)
+        offset = ordinal - self._first
+        for column, tree, value in zip(self._values, self._trees, values):
+            column[offset] += value
+            i = offset + 1
+            while i <= size:
+                tree[i] += value
+                i += i & -i
+
+    def _prefix(self, tree, count):
+        """Sum of the first count days of one field."""
+        total = 0
+        while count > 0:
+            total += tree[count]
+            count -= count & -count
+        return total
+
+    def totals(self, first_ordinal, last_ordinal):
+        """Return per-field sums over the inclusive day range [first_ordinal, last_ordinal]."""
+        if self._first is None:
+            return tuple(0 for _ in self.fields)
+        lo = max(first_ordinal - self._first, 0)
+        hi = min(last_ordinal - self._first + 1, len(self))
+        if lo >= hi:
+            return tuple(0 for _ in self.fields)
+        return tuple(self._prefix(tree, hi) - self._prefix(tree, lo) for tree in self._trees)
+
+
+class TagIndex:
+    """Inverted index from project and tag names to the sessions carrying them.
+
+    Each posting maps a session id (its start_time) to (day ordinal, actual
+    focus seconds, slack seconds), so filtered session sets and per-project
+    or per-tag totals come from the postings alone, scanning only the
+    shortest matching posting list instead of the session history.
+    """
+
+    def __init__(self):
+        self.projects = {}
+        self.tags = {}
+
+    def add(self, kind, name, session_id, ordinal, actual, slack):
+        """Add one posting; kind is "projects" or "tags"."""
+        getattr(self, kind).setdefault(name, {})[session_id] = (ordinal, actual, slack)
+
+    def add_session(self, session_id, ordinal, project, tags, actual, slack):
+        """Index one session under its project and each of its tags."""
+        if project:
+            self.add("projects", project, session_id, ordinal, actual, slack)
+        for tag in tags:
+            self.add("tags", tag, session_id, ordinal, actual, slack)
+
+    def names(self):
+        """Return (sorted project names, sorted tag names)."""
+        return sorted(self.projects), sorted(self.tags)
+
+    def matches(self, project=None, tags=(), first=None, last=None):
+        """Return {session_id: (ordinal, actual, slack)} for sessions with the project and all tags.
+
+        first/last limit the inclusive day-ordinal range; None leaves that end open.
+        """
+        postings = []
+        if project is not None:
+            postings.append(self.projects.get(project, {}))
+        postings.extend(self.tags.get(tag, {}) for tag in tags)
+        if not postings:
+            return {}
+        postings.sort(key=len)
+        shortest, others = postings[0], postings[1:]
+        return {
+            session_id: posting for session_id, posting in shortest.items()
+            if (first is None or posting[0] >= first)
+            and (last is None or posting[0] <= last)
+            and all(session_id in other for other in others)
+        }
+
+    def totals(self, project=None, tags=(), first=None, last=None):
+        """Return session count and actual/slack seconds for the sessions matches() selects."""
+        found = self.matches(project, tags, first, last)
+        return {
+            "sessions": len(found),
+            "actual": sum(posting[1] for posting in found.values()),
+            "slack": sum(posting[2] for posting in found.values()),
+        }
+
+
+class GoalStreaks:
+    """Current and best runs of consecutive days whose focus time meets a daily goal.
+
+    Keeps each day's focus seconds plus the run ending at the latest goal-met
+    day. add() fixes the counters up in O(1) when a day at or after that run
+    reaches the goal; only a backfilled older day or a goal change rescans
+    the days.
+    """
+
+    def __init__(self, goal_seconds, daily=None):
+        self.goal = goal_seconds
+        self._daily = dict(daily or {})
+        self._rebuild()
+
+    def _rebuild(self):
+        """Recompute the latest run and the best run from the daily totals in O(days)."""
+        self._run_end = None
+        self._run_length = 0
+        self.best = 0
+        if self.goal <= 0:
+            return
+        for ordinal in sorted(day for day, focus in self._daily.items() if focus >= self.goal):
+            if self._run_end == ordinal - 1:
+                self._run_length += 1
+            else:
+                self._run_length = 1
+            self._run_end = ordinal
+            self.best = max(self.best, self._run_length)
+
+    def set_goal(self, goal_seconds):
+        """Change the daily goal and recompute the streaks."""
+        self.goal = goal_seconds
+        self._rebuild()
+
+    def add(self, ordinal, focus_seconds):
+        """Add focus seconds to one day, extending the streaks if it just met the goal."""
+        before = self._daily.get(ordinal, 0)
+        after = before + focus_seconds
+        self._daily[ordinal] = after
+        if self.goal <= 0 or before >= self.goal or after < self.goal:
+            return
+        if self._run_end is not None and ordinal <= self._run_end:
+            # An older day newly met the goal; it may join or bridge earlier runs.
+            self._rebuild()
+            return
+        self._run_length = self._run_length + 1 if self._run_end == ordinal - 1 else 1
+        self._run_end = ordinal
+        self.best = max(self.best, self._run_length)
+
+    def focus_on(self, ordinal):
+        """Return the focus seconds recorded for one day."""
+        return self._daily.get(ordinal, 0)
+
+    def current(self, today_ordinal):
+        """Return the streak still alive on today: it ends today, or yesterday if today is not yet met."""
+        if self._run_end is not None and today_ordinal - 1 <= self._run_end <= today_ordinal:
+            return self._run_length
+        return 0
@@ -0,0 +1,74 @@
+"""Cross-process advisory locks for the shared stats directory.
+
+Uses fcntl.flock where available (Linux/macOS). Elsewhere a lock is an
+exclusively created lock file that is removed on release; a lock file left
+behind by a crashed process is broken once it is older than
+STATS_LOCK_STALE_SECONDS. Locks are only held for short appends and file
+swaps, so waiting writers spin briefly.
+"""
+
+import os
+import socket
+import time
+from contextlib import contextmanager
+
+from src.config import STATS_LOCK_STALE_SECONDS
+from src.debug_log import get_debug_logger
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+_logger = get_debug_logger("truefocus.stats")
+
+_POLL_SECONDS = 0.02
+
+
+@contextmanager
+def file_lock(path):
+    """Hold an exclusive advisory lock on path for the duration of the with block."""
+    if fcntl is not None:
+        with open(path, 'a') as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+        return
+
+    _acquire_lock_file(path)
+    try:
+        yield
+    finally:
+        try:
+            os.remove(path)
+        except OSError:
+            _logger.warning("lock-release-failed path=%s", path)
+
+
+def _acquire_lock_file(path):
+    """Create path exclusively, waiting for the holder or breaking a stale lock."""
+    owner = f"{socket.gethostname()} {os.getpid()}\n".encode("utf-8")
+    while True:
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            try:
+                age = time.time() - os.path.getmtime(path)
+            except OSError:
+                continue  # Released between the two calls.
+            if age > STATS_LOCK_STALE_SECONDS:
+                _logger.warning("lock-stale-broken path=%s age=%.1f", path, age)
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                continue
+            time.sleep(_POLL_SECONDS)
+            continue
+        try:
+            os.write(fd, owner)
+        finally:
+            os.close(fd)
+        return
@@ -0,0 +1,231 @@
+"""Compact in-memory session records for TrueFocus Timer stats.
+
+Finished sessions stay resident for the app's lifetime, so they are kept as
+read-only ``__slots__`` records instead of dicts: no per-session key storage,
+interned outcome/project/tag strings, and slack segments held as a tuple of
+``SlackSegmentRecord`` slot objects. Records behave like read-only dicts
+(``get``, ``[]``, ``**``, ``items``) and are written back out as plain JSON
+objects via ``json_default``.
+"""
+
+import sys
+from collections.abc import Mapping
+
+SEGMENT_FIELDS = ("start_time", "end_time", "duration_seconds", "start_ts", "end_ts")
+SESSION_FIELDS = (
+    "start_time",
+    "end_time",
+    "start_ts",
+    "end_ts",
+    "utc_offset",
+    "initial_productivity_time",
+    "total_slack_time",
+    "work_time_actual",
+    "slack_events_count",
+    "slack_segments",
+    "outcome",
+    "project",
+    "tags",
+)
+_SEGMENT_FIELD_SET = frozenset(SEGMENT_FIELDS)
+# Segments written before epoch timestamps were added (schema version 1).
+_LEGACY_SEGMENT_FIELD_SET = frozenset(SEGMENT_FIELDS[:3])
+_UNSET = object()
+_SESSION_FIELD_SET = frozenset(SESSION_FIELDS)
+# Session outcomes and their compact codes (the columnar view stores the codes).
+OUTCOME_CODES = {"completed": 0, "reset_early": 1, "interrupted": 2}
+
+
+class SlackSegmentRecord(Mapping):
+    """Read-only slack segment (ISO start/end, duration and, when known, epoch start/end)."""
+
+    __slots__ = SEGMENT_FIELDS
+
+    def __init__(self, start_time, end_time, duration_seconds, start_ts=_UNSET, end_ts=_UNSET):
+        self.start_time = start_time
+        self.end_time = end_time
+        self.duration_seconds = duration_seconds
+        if start_ts is not _UNSET:
+            self.start_ts = start_ts
+        if end_ts is not _UNSET:
+            self.end_ts = end_ts
+
+    def __getitem__(self, key):
+        if key in _SEGMENT_FIELD_SET:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        if key in _SEGMENT_FIELD_SET:
+            return getattr(self, key, default)
+        return default
+
+    def __iter__(self):
+        return (key for key in SEGMENT_FIELDS if hasattr(self, key))
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"SlackSegmentRecord({self.to_dict()!r})"
+
+    def to_dict(self):
+        """Return the segment as a plain dict."""
+        return {key: getattr(self, key) for key in self}
+
+
+class SessionRecord(Mapping):
+    """Finished session; treated as read-only once built.
+
+    Known fields live in slots (absent fields are simply unset); any other
+    keys found in the stored JSON are kept in a small side dict so they
+    survive a round trip.
+    """
+
+    __slots__ = SESSION_FIELDS + ("_extra", "_metrics_view")
+
+    def __init__(self, session):
+        extra = None
+        for key, value in session.items():
+            if key not in _SESSION_FIELD_SET:
+                if extra is None:
+                    extra = {}
+                extra[sys.intern(key)] = value
+            elif key == "slack_segments":
+                setattr(self, key, tuple(compact_segment(seg) for seg in value))
+            elif key in ("outcome", "project") and isinstance(value, str):
+                setattr(self, key, sys.intern(value))
+            elif key == "tags" and isinstance(value, (list, tuple)):
+                setattr(self, key, tuple(sys.intern(tag) if isinstance(tag, str) else tag for tag in value))
+            else:
+                setattr(self, key, value)
+        self._extra = extra
+
+    def __getitem__(self, key):
+        if key in _SESSION_FIELD_SET:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        if key in _SESSION_FIELD_SET:
+            return getattr(self, key, default)
+        if self._extra is not None:
+            return self._extra.get(key, default)
+        return default
+
+    def __contains__(self, key):
+        if key in _SESSION_FIELD_SET:
+            return hasattr(self, key)
+        return self._extra is not None and key in self._extra
+
+    def __iter__(self):
+        for key in SESSION_FIELDS:
+            if hasattr(self, key):
+                yield key
+        if self._extra is not None:
+            yield from self._extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"SessionRecord({self.to_dict()!r})"
+
+    def with_metrics(self, compute):
+        """Return this session plus compute(self)'s derived metrics as a SessionWithMetrics view.
+
+        Records are read-only, so the view is built once and kept on the record.
+        """
+        try:
+            return self._metrics_view
+        except AttributeError:
+            view = self._metrics_view = SessionWithMetrics(self, compute(self))
+            return view
+
+    def to_dict(self):
+        """Return the session as a plain JSON-compatible dict."""
+        data = {}
+        for key in self:
+            value = self[key]
+            if key == "slack_segments":
+                value = [seg.to_dict() if isinstance(seg, SlackSegmentRecord) else seg for seg in value]
+            elif key == "tags" and isinstance(value, tuple):
+                value = list(value)
+            data[key] = value
+        return data
+
+
+class SessionWithMetrics(Mapping):
+    """Read-only session record plus its derived metrics, without copying the session's fields."""
+
+    __slots__ = ("session", "metrics")
+
+    def __init__(self, session, metrics):
+        self.session = session
+        self.metrics = metrics
+
+    def __getitem__(self, key):
+        if key in self.metrics:
+            return self.metrics[key]
+        return self.session[key]
+
+    def get(self, key, default=None):
+        if key in self.metrics:
+            return self.metrics[key]
+        return self.session.get(key, default)
+
+    def __contains__(self, key):
+        return key in self.metrics or key in self.session
+
+    def __iter__(self):
+        yield from (key for key in self.session if key not in self.metrics)
+        yield from self.metrics
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"SessionWithMetrics({self.to_dict()!r})"
+
+    def to_dict(self):
+        """Return the session and its metrics as a plain dict."""
+        return {**self.session.to_dict(), **self.metrics}
+
+
+def compact_segment(segment):
+    """Pack a slack segment dict into a SlackSegmentRecord when it has exactly the standard keys."""
+    if isinstance(segment, SlackSegmentRecord):
+        return segment
+    if isinstance(segment, dict):
+        keys = segment.keys()
+        if keys == _SEGMENT_FIELD_SET or keys == _LEGACY_SEGMENT_FIELD_SET:
+            return SlackSegmentRecord(
+                segment["start_time"],
+                segment["end_time"],
+                segment["duration_seconds"],
+                segment.get("start_ts", _UNSET),
+                segment.get("end_ts", _UNSET),
+            )
+    return segment
+
+
+def compact_session(session):
+    """Return a SessionRecord for a session dict (records are returned unchanged)."""
+    if isinstance(session, SessionRecord):
+        return session
+    return SessionRecord(session)
+
+
+def json_default(obj):
+    """``default=`` hook for json.dump(s) that writes records as plain objects."""
+    if isinstance(obj, (SessionRecord, SlackSegmentRecord, SessionWithMetrics)):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
@@ -0,0 +1,123 @@
+"""Mergeable streaming sketch of interruption (slack segment) durations."""
+
+import math
+from bisect import bisect_right
+
+# Relative accuracy of quantile estimates (1% of the true value).
+RELATIVE_ACCURACY = 0.01
+_GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+_LOG_GAMMA = math.log(_GAMMA)
+
+# Coarse histogram bin edges in seconds: <1m, 1-5m, 5-15m, 15-30m, 30-60m, 60m+.
+HISTOGRAM_EDGES = (60, 300, 900, 1800, 3600)
+HISTOGRAM_LABELS = ("<1m", "1-5m", "5-15m", "15-30m", "30-60m", "60m+")
+
+
+class DurationSketch:
+    """Log-bucketed quantile sketch (DDSketch-style) plus a fixed coarse histogram.
+
+    add() and merge() are O(1) per value/bucket and the state is bounded by
+    the number of log buckets spanned (a few hundred for one second to one
+    day), so quantiles never rescan the underlying segments. Quantiles are
+    within RELATIVE_ACCURACY of the true value and capped at the exact max.
+    """
+
+    __slots__ = ("count", "total", "zero_count", "max", "bins", "histogram")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.zero_count = 0
+        self.max = None
+        self.bins = {}
+        self.histogram = [0] * (len(HISTOGRAM_EDGES) + 1)
+
+    def add(self, duration):
+        """Record one duration in seconds."""
+        duration = max(int(duration), 0)
+        self.count += 1
+        self.total += duration
+        if self.max is None or duration > self.max:
+            self.max = duration
+        if duration == 0:
+            self.zero_count += 1
+        else:
+            index = math.ceil(math.log(duration) / _LOG_GAMMA)
+            self.bins[index] = self.bins.get(index, 0) + 1
+        self.histogram[bisect_right(HISTOGRAM_EDGES, duration)] += 1
+
+    def merge(self, other):
+        """Fold another sketch into this one; returns self."""
+        if other is None or not other.count:
+            return self
+        self.count += other.count
+        self.total += other.total
+        self.zero_count += other.zero_count
+        if self.max is None or other.max > self.max:
+            self.max = other.max
+        for index, count in other.bins.items():
+            self.bins[index] = self.bins.get(index, 0) + count
+        self.histogram = [a + b for a, b in zip(self.histogram, other.histogram)]
+        return self
+
+    def copy(self):
+        """Return an independent copy."""
+        return DurationSketch().merge(self)
+
+    def quantile(self, q):
+        """Return the estimated q-quantile (0..1) in whole seconds, or None if empty."""
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0
+        for index in sorted(self.bins):
+            seen += self.bins[index]
+            if rank < seen:
+                estimate = 2 * _GAMMA ** index / (_GAMMA + 1)
+                return min(int(round(estimate)), self.max)
+        return self.max
+
+    def summary(self):
+        """Return count, mean, p50/p90/p99, max and the coarse histogram."""
+        return {
+            "count": self.count,
+            "mean": (self.total / self.count) if self.count else None,
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p99": self.quantile(0.99),
+            "max": self.max,
+            "histogram": dict(zip(HISTOGRAM_LABELS, self.histogram)),
+        }
+
+    def to_dict(self):
+        """Return a compact JSON-compatible form."""
+        return {
+            "n": self.count,
+            "sum": self.total,
+            "zero": self.zero_count,
+            "max": self.max,
+            "bins": {str(index): count for index, count in self.bins.items()},
+            "hist": list(self.histogram),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a sketch from to_dict() output (None or malformed input gives an empty sketch)."""
+        sketch = cls()
+        if not isinstance(data, dict):
+            return sketch
+        try:
+            sketch.count = int(data["n"])
+            sketch.total = int(data["sum"])
+            sketch.zero_count = int(data["zero"])
+            sketch.max = data["max"]
+            sketch.bins = {int(index): int(count) for index, count in data["bins"].items()}
+            hist = [int(count) for count in data["hist"]]
+            if len(hist) != len(sketch.histogram):
+                return cls()
+            sketch.histogram = hist
+        except (KeyError, TypeError, ValueError, AttributeError):
+            return cls()
+        return sketch
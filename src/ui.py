@@ -3,8 +3,12 @@
 import io
 import os
 import tkinter as tk
+from datetime import timedelta
+from tkinter import simpledialog
 
 from src.audio import get_script_dir
+from src.stats import calculate_efficiency, find_most_disrupted, session_clock_label, summarize_rollup
+from src.stats_heatmap import WEEKDAY_LABELS
 from src.config import (
     PRESET_TIME_1H_SECONDS,
     PRESET_TIME_2H_SECONDS,
@@ -24,6 +28,9 @@ except ImportError:
     ImageTk = None
 
 
+ALL_FILTER = "All"
+
+
 class UIBuilder:
     """Builds and manages UI widgets."""
 
@@ -301,7 +308,61 @@ class UIBuilder:
         else:
             self.stats_btn.config(text="STATS")
 
-        # Widgets that control initial timer duration.
+        # Project and tags for the next session (second settings row).
+        self.labels_row = tk.Frame(
+            self.root,
+            bg=self.get_t("settings_bg"),
+            relief=tk.RAISED,
+            bd=2
+        )
+        self.labels_row.pack(pady=(0, 10), padx=20, fill=tk.X)
+
+        self.project_label = tk.Label(
+            self.labels_row,
+            text="Project:",
+            font=('Arial', 11),
+            bg=self.get_t("settings_bg"),
+            fg=self.get_t("text_light")
+        )
+        self.project_label.pack(side=tk.LEFT, padx=10)
+
+        self.project_entry = tk.Entry(
+            self.labels_row,
+            width=20,
+            font=('Arial', 11),
+            bg=self.get_t("frame_bg"),
+            fg=self.get_t("text_dark")
+        )
+        self.project_entry.pack(side=tk.LEFT, padx=2, pady=4)
+
+        self.tags_label = tk.Label(
+            self.labels_row,
+            text="Tags:",
+            font=('Arial', 11),
+            bg=self.get_t("settings_bg"),
+            fg=self.get_t("text_light")
+        )
+        self.tags_label.pack(side=tk.LEFT, padx=(15, 5))
+
+        self.tags_entry = tk.Entry(
+            self.labels_row,
+            width=30,
+            font=('Arial', 11),
+            bg=self.get_t("frame_bg"),
+            fg=self.get_t("text_dark")
+        )
+        self.tags_entry.pack(side=tk.LEFT, padx=2, pady=4)
+
+        self.tags_hint = tk.Label(
+            self.labels_row,
+            text="comma-separated",
+            font=('Arial', 9),
+            bg=self.get_t("settings_bg"),
+            fg=self.get_t("text_muted")
+        )
+        self.tags_hint.pack(side=tk.LEFT, padx=5)
+
+        # Widgets that control initial timer duration (and the session's project/tags).
         self.time_selection_widgets = [
             self.time_btn_1hr,
             self.time_btn_2hr,
@@ -312,6 +373,8 @@ class UIBuilder:
             self.custom_mins_entry,
             self.mins_plus_btn,
             self.custom_btn,
+            self.project_entry,
+            self.tags_entry,
         ]
 
     def create_clocks(self):
@@ -484,6 +547,16 @@ class UIBuilder:
         )
         self.version_label.pack(side=tk.RIGHT, anchor=tk.E)
 
+        # Filled in once the stats history has warmed up.
+        self.streak_label = tk.Label(
+            self.footer,
+            text="",
+            font=('Arial', 9, 'bold'),
+            bg=self.get_t("main_bg"),
+            fg=self.get_t("text_muted")
+        )
+        self.streak_label.pack(side=tk.LEFT, expand=True)
+
     def apply_theme(self):
         """Apply the current theme to all widgets."""
         # Main window
@@ -549,6 +622,21 @@ class UIBuilder:
             bg=self.get_t("button_inactive"),
             fg=self.get_t("text_light")
         )
+        self.labels_row.config(bg=self.get_t("settings_bg"))
+        for label in (self.project_label, self.tags_label):
+            label.config(
+                bg=self.get_t("settings_bg"),
+                fg=self.get_t("text_light")
+            )
+        self.tags_hint.config(
+            bg=self.get_t("settings_bg"),
+            fg=self.get_t("text_muted")
+        )
+        for entry in (self.project_entry, self.tags_entry):
+            entry.config(
+                bg=self.get_t("frame_bg"),
+                fg=self.get_t("text_dark")
+            )
         self.theme_toggle_btn.config(
             text="",
             image=self._get_theme_button_icon(),
@@ -628,6 +716,18 @@ class UIBuilder:
             bg=self.get_t("main_bg"),
             fg=self.get_t("text_muted")
         )
+        self.streak_label.config(
+            bg=self.get_t("main_bg"),
+            fg=self.get_t("text_muted")
+        )
+
+    def get_session_labels(self):
+        """Return the (project, tags) text entered for the next session."""
+        return self.project_entry.get(), self.tags_entry.get()
+
+    def update_streak_display(self, summary):
+        """Show the daily goal progress and streaks in the main window footer."""
+        self.streak_label.config(text=self._format_streak(summary))
 
     def update_player_times(self, time1_str, time2_str):
         """Update displayed times for both players."""
@@ -742,8 +842,10 @@ class UIBuilder:
         win.geometry("1200x750")
         win.configure(bg=self.get_t("main_bg"))
 
-        sessions = self.clock_app.stats_tracker.get_sessions_with_metrics()
+        tracker = self.clock_app.stats_tracker
         today = datetime.now().date()
+        today_sessions = self._get_today_sessions()
+        today_rollup = tracker.get_day_rollup(today)
 
         # State: track selected date and current month
         state = {
@@ -755,9 +857,116 @@ class UIBuilder:
             "headline_row": None,
             "insight_row": None,
             "month_label": None,
-            "cal_grid_frame": None
+            "cal_grid_frame": None,
+            "range_mode": False,
+            "range_start": None,
+            "range_end": None,
+            "range_button": None,
+            "filter_project": None,
+            "filter_tag": None,
+            "filter_summary": None
         }
 
+        def on_day_click(day):
+            """Route calendar clicks to single-day or range selection."""
+            if state["range_mode"]:
+                select_range_day(day)
+            else:
+                update_display(day)
+
+        def redraw_calendar():
+            """Redraw the calendar grid for the displayed month."""
+            if state.get("cal_grid_frame"):
+                for widget in state["cal_grid_frame"].winfo_children():
+                    widget.destroy()
+                self._render_calendar_grid(state["cal_grid_frame"], state, on_day_click)
+
+        def select_range_day(day):
+            """First click starts a range, the second click closes it and shows its totals."""
+            if state["range_start"] is None or state["range_end"] is not None:
+                state["range_start"], state["range_end"] = day, None
+                if state["header_label"]:
+                    state["header_label"].config(text=f"{day.strftime('%b %d, %Y')} \u2013 pick an end date")
+                redraw_calendar()
+                return
+            start, end = sorted((state["range_start"], day))
+            state["range_start"], state["range_end"] = start, end
+            update_range_display(start, end)
+
+        def update_filter_summary(start, end, period_label):
+            """Show project/tag filter totals for [start, end] from the tag index."""
+            if not state["filter_summary"]:
+                return
+            if state["filter_project"] is None and state["filter_tag"] is None:
+                state["filter_summary"].config(text="")
+                return
+            tags = () if state["filter_tag"] is None else (state["filter_tag"],)
+            totals = tracker.get_label_totals(state["filter_project"], tags, start, end)
+            state["filter_summary"].config(
+                text=(
+                    f"{totals['sessions']} matching session(s) {period_label}: "
+                    f"{self._format_seconds(totals['actual'])} focus, {self._format_seconds(totals['slack'])} slack"
+                )
+            )
+
+        def filter_sessions(sessions, day):
+            """Keep only sessions matching the project/tag filter (looked up in the tag index)."""
+            if state["filter_project"] is None and state["filter_tag"] is None:
+                return sessions
+            tags = () if state["filter_tag"] is None else (state["filter_tag"],)
+            ids = tracker.get_label_session_ids(state["filter_project"], tags, day, day)
+            return [session for session in sessions if session.get("start_time") in ids]
+
+        def set_filter(key, value):
+            """Apply a project or tag filter choice and refresh the current view."""
+            state[key] = None if value == ALL_FILTER else value
+            if state["range_mode"] and state["range_end"] is not None:
+                update_range_display(state["range_start"], state["range_end"])
+            elif not state["range_mode"]:
+                update_display(state["selected_date"])
+
+        def update_range_display(start, end):
+            """Show totals for an inclusive date range from the tracker's range index."""
+            range_rollup = tracker.get_range_totals(start, end)
+            insights = tracker.get_range_insights(start, end)
+            range_rollup["longest_interruption"] = insights["longest_interruption"]
+            update_filter_summary(start, end, "in this range")
+            if state["header_label"]:
+                state["header_label"].config(text=f"{start.strftime('%b %d, %Y')} \u2013 {end.strftime('%b %d, %Y')}")
+            if state["headline_row"]:
+                for widget in state["headline_row"].winfo_children():
+                    widget.destroy()
+                self._render_headline_metrics(state["headline_row"], range_rollup)
+            if state["insight_row"]:
+                for widget in state["insight_row"].winfo_children():
+                    widget.destroy()
+                self._render_insights(
+                    state["insight_row"], [], range_rollup,
+                    most_disrupted=(insights["most_disrupted"], insights["most_disrupted_ratio"]),
+                )
+            if state["table_container"]:
+                for widget in state["table_container"].winfo_children():
+                    widget.destroy()
+                span_days = (end - start).days + 1
+                period = "day" if span_days <= 31 else "week" if span_days <= 183 else "month"
+                self._render_period_table(
+                    state["table_container"], tracker.get_period_totals(period, start, end), period
+                )
+            redraw_calendar()
+
+        def toggle_range_mode():
+            """Switch the calendar between single-day and range selection."""
+            state["range_mode"] = not state["range_mode"]
+            state["range_start"] = state["range_end"] = None
+            if state["range_button"]:
+                state["range_button"].config(text="Single Day" if state["range_mode"] else "Select Range")
+            if state["range_mode"]:
+                if state["header_label"]:
+                    state["header_label"].config(text="Pick a start date")
+                redraw_calendar()
+            else:
+                update_display(state["selected_date"])
+
         def update_display(selected_date):
             """Update left side when a date is selected."""
             state["selected_date"] = selected_date
@@ -767,33 +976,34 @@ class UIBuilder:
             if state["header_label"]:
                 state["header_label"].config(text=date_str)
 
-            # Get sessions for selected date
-            selected_sessions = self._get_sessions_by_date(sessions, selected_date)
+            # Get sessions and the per-day rollup for selected date
+            selected_sessions = self._get_sessions_by_date(selected_date)
+            selected_rollup = tracker.get_day_rollup(selected_date)
+            month_start = selected_date.replace(day=1)
+            month_end = (month_start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+            update_filter_summary(month_start, month_end, f"in {selected_date:%B %Y}")
 
             # Update headline metrics
             if state["headline_row"]:
                 for widget in state["headline_row"].winfo_children():
                     widget.destroy()
-                self._render_headline_metrics(state["headline_row"], selected_sessions)
+                self._render_headline_metrics(state["headline_row"], selected_rollup)
 
             # Update insights
             if state["insight_row"]:
                 for widget in state["insight_row"].winfo_children():
                     widget.destroy()
-                self._render_insights(state["insight_row"], selected_sessions)
+                self._render_insights(state["insight_row"], selected_sessions, selected_rollup)
 
             # Update session table
             if state["table_container"]:
                 for widget in state["table_container"].winfo_children():
                     widget.destroy()
-                self._render_session_table(state["table_container"], selected_sessions)
+                self._render_session_table(state["table_container"], filter_sessions(selected_sessions, selected_date))
 
             # Redraw calendar grid to show selected date in orange
-            if state.get("cal_grid_frame"):
-                if selected_date.month == state["current_month"] and selected_date.year == state["current_year"]:
-                    for widget in state["cal_grid_frame"].winfo_children():
-                        widget.destroy()
-                    self._render_calendar_grid(state["cal_grid_frame"], sessions, state, update_display)
+            if selected_date.month == state["current_month"] and selected_date.year == state["current_year"]:
+                redraw_calendar()
 
         def change_month(delta):
             """Navigate to previous/next month."""
@@ -811,10 +1021,7 @@ class UIBuilder:
                 state["month_label"].config(text=f"{calendar.month_name[state['current_month']]} {state['current_year']}")
 
             # Redraw only the calendar grid (not buttons)
-            if state.get("cal_grid_frame"):
-                for widget in state["cal_grid_frame"].winfo_children():
-                    widget.destroy()
-            self._render_calendar_grid(state["cal_grid_frame"], sessions, state, update_display)
+            redraw_calendar()
 
         header = tk.Frame(win, bg=self.get_t("main_bg"))
         header.pack(fill=tk.X, padx=20, pady=(16, 8))
@@ -828,6 +1035,32 @@ class UIBuilder:
         )
         state["header_label"].pack(side=tk.LEFT)
 
+        goal_label = tk.Label(
+            header,
+            text=self._format_streak(tracker.get_streak_summary(today)),
+            font=('Arial', 11, 'bold'),
+            bg=self.get_t("main_bg"),
+            fg=self.get_t("text_light")
+        )
+        goal_label.pack(side=tk.LEFT, padx=(20, 0))
+
+        def set_goal():
+            """Ask for a new daily goal in minutes and refresh both streak displays."""
+            minutes = simpledialog.askinteger(
+                "Daily Goal",
+                "Daily focus goal (minutes):",
+                parent=win,
+                initialvalue=tracker.get_streak_summary(today)["goal"] // 60,
+                minvalue=1,
+                maxvalue=24 * 60
+            )
+            if minutes is None:
+                return
+            tracker.set_daily_goal(minutes * 60)
+            summary = tracker.get_streak_summary(today)
+            goal_label.config(text=self._format_streak(summary))
+            self.update_streak_display(summary)
+
         tk.Button(
             header,
             text="Close",
@@ -838,13 +1071,61 @@ class UIBuilder:
             fg=self.get_t("text_light")
         ).pack(side=tk.RIGHT)
 
+        tk.Button(
+            header,
+            text="Heatmap",
+            command=lambda: self._show_heatmap_window(win),
+            font=('Arial', 11),
+            width=8,
+            bg=self.get_t("button_inactive"),
+            fg=self.get_t("text_light")
+        ).pack(side=tk.RIGHT, padx=(0, 8))
+
+        tk.Button(
+            header,
+            text="Set Goal",
+            command=set_goal,
+            font=('Arial', 11),
+            width=8,
+            bg=self.get_t("button_inactive"),
+            fg=self.get_t("text_light")
+        ).pack(side=tk.RIGHT, padx=(0, 8))
+
         state["headline_row"] = tk.Frame(win, bg=self.get_t("main_bg"))
         state["headline_row"].pack(fill=tk.X, padx=20, pady=(0, 10))
-        self._render_headline_metrics(state["headline_row"], self._get_today_sessions(sessions))
+        self._render_headline_metrics(state["headline_row"], today_rollup)
 
         state["insight_row"] = tk.Frame(win, bg=self.get_t("main_bg"))
         state["insight_row"].pack(fill=tk.X, padx=20, pady=(0, 10))
-        self._render_insights(state["insight_row"], self._get_today_sessions(sessions))
+        self._render_insights(state["insight_row"], today_sessions, today_rollup)
+
+        # Project/tag filters: narrow the session list and total the matches per month or range.
+        filter_row = tk.Frame(win, bg=self.get_t("main_bg"))
+        filter_row.pack(fill=tk.X, padx=20, pady=(0, 10))
+        project_names, tag_names = tracker.get_label_names()
+        for text, key, names in (("Project:", "filter_project", project_names), ("Tag:", "filter_tag", tag_names)):
+            tk.Label(
+                filter_row,
+                text=text,
+                font=('Arial', 10),
+                bg=self.get_t("main_bg"),
+                fg=self.get_t("text_light")
+            ).pack(side=tk.LEFT, padx=(0, 4))
+            choice = tk.StringVar(win, value=ALL_FILTER)
+            menu = tk.OptionMenu(
+                filter_row, choice, ALL_FILTER, *names,
+                command=lambda value, key=key: set_filter(key, value)
+            )
+            menu.config(bg=self.get_t("button_inactive"), fg=self.get_t("text_light"), highlightthickness=0)
+            menu.pack(side=tk.LEFT, padx=(0, 12))
+        state["filter_summary"] = tk.Label(
+            filter_row,
+            text="",
+            font=('Arial', 10),
+            bg=self.get_t("main_bg"),
+            fg=self.get_t("text_light")
+        )
+        state["filter_summary"].pack(side=tk.LEFT)
 
         # Main content with two columns
         content_frame = tk.Frame(win, bg=self.get_t("main_bg"))
@@ -856,7 +1137,7 @@ class UIBuilder:
 
         state["table_container"] = tk.Frame(left_frame, bg=self.get_t("main_bg"))
         state["table_container"].pack(fill=tk.BOTH, expand=True)
-        self._render_session_table(state["table_container"], self._get_today_sessions(sessions))
+        self._render_session_table(state["table_container"], today_sessions)
 
         # Right column: calendar
         right_frame = tk.Frame(content_frame, bg=self.get_t("main_bg"))
@@ -875,6 +1156,16 @@ class UIBuilder:
         )
         cal_header.pack(pady=(0, 10))
 
+        state["range_button"] = tk.Button(
+            cal_header_frame,
+            text="Select Range",
+            font=('Arial', 9),
+            command=toggle_range_mode,
+            bg=self.get_t("button_inactive"),
+            fg=self.get_t("text_light")
+        )
+        state["range_button"].pack()
+
         # Navigation frame
         nav_frame = tk.Frame(right_frame, bg=self.get_t("main_bg"))
         nav_frame.pack(fill=tk.X, pady=(0, 10))
@@ -914,45 +1205,106 @@ class UIBuilder:
 
         # Initial render
         import calendar
-        self._render_calendar_grid(state["cal_grid_frame"], sessions, state, update_display)
+        self._render_calendar_grid(state["cal_grid_frame"], state, on_day_click)
+
+    def _show_heatmap_window(self, parent):
+        """Show the all-time weekday x hour-of-day slack/focus heatmap."""
+        heatmap = self.clock_app.stats_tracker.get_heatmap()
+
+        win = tk.Toplevel(parent)
+        win.title("Slack Heatmap")
+        win.configure(bg=self.get_t("main_bg"))
+
+        state = {"field": "slack"}
+        cell_w, cell_h, left, top = 26, 26, 44, 24
+        canvas = tk.Canvas(
+            win,
+            width=left + 24 * cell_w + 8,
+            height=top + 7 * cell_h + 8,
+            bg=self.get_t("main_bg"),
+            highlightthickness=0
+        )
+
+        def draw():
+            """Redraw all 168 cells for the selected field."""
+            canvas.delete("all")
+            rows = heatmap.rows(state["field"])
+            peak = max(max(row) for row in rows) or 1
+            hot = self.get_t("warning_medium") if state["field"] == "slack" else self.get_t("button_active")
+            for hour in range(0, 24, 3):
+                canvas.create_text(
+                    left + hour * cell_w + cell_w / 2, top / 2,
+                    text=f"{hour:02d}", fill=self.get_t("text_light"), font=('Arial', 8)
+                )
+            for day, row in enumerate(rows):
+                y = top + day * cell_h
+                canvas.create_text(
+                    left / 2, y + cell_h / 2,
+                    text=WEEKDAY_LABELS[day], fill=self.get_t("text_light"), font=('Arial', 9)
+                )
+                for hour, seconds in enumerate(row):
+                    x = left + hour * cell_w
+                    canvas.create_rectangle(
+                        x, y, x + cell_w - 2, y + cell_h - 2,
+                        fill=self._blend_hex(self.get_t("frame_bg"), hot, seconds / peak),
+                        outline=""
+                    )
+            title_label.config(
+                text=f"{'Slack' if state['field'] == 'slack' else 'Focus'} by weekday and hour (peak {self._format_seconds(peak)})"
+            )
+
+        def toggle_field():
+            """Switch between slack and focus seconds."""
+            state["field"] = "focus" if state["field"] == "slack" else "slack"
+            toggle_button.config(text="Show Slack" if state["field"] == "focus" else "Show Focus")
+            draw()
 
-    def _get_today_sessions(self, sessions):
-        """Filter sessions to today by local date."""
+        title_label = tk.Label(
+            win,
+            font=('Arial', 12, 'bold'),
+            bg=self.get_t("main_bg"),
+            fg=self.get_t("text_light")
+        )
+        title_label.pack(padx=16, pady=(12, 6))
+        canvas.pack(padx=16)
+        toggle_button = tk.Button(
+            win,
+            text="Show Focus",
+            command=toggle_field,
+            font=('Arial', 10),
+            bg=self.get_t("button_inactive"),
+            fg=self.get_t("text_light")
+        )
+        toggle_button.pack(pady=(6, 12))
+        draw()
+
+    def _blend_hex(self, hex_a, hex_b, ratio):
+        """Blend two #rrggbb colors; ratio 0 gives hex_a and 1 gives hex_b."""
+        ratio = min(max(ratio, 0), 1)
+        a = [int(hex_a[i:i + 2], 16) for i in (1, 3, 5)]
+        b = [int(hex_b[i:i + 2], 16) for i in (1, 3, 5)]
+        return "#" + "".join(f"{round(x + (y - x) * ratio):02x}" for x, y in zip(a, b))
+
+    def _get_today_sessions(self):
+        """Get sessions (with metrics) for today by local date."""
         from datetime import datetime
 
         today = datetime.now().date()
-        return self._get_sessions_by_date(sessions, today)
+        return self._get_sessions_by_date(today)
 
-    def _get_sessions_by_date(self, sessions, target_date):
-        """Filter sessions to a specific date."""
-        from datetime import datetime
+    def _get_sessions_by_date(self, target_date):
+        """Get sessions (with metrics) for a specific date."""
+        return self.clock_app.stats_tracker.get_sessions_on(target_date)
 
-        filtered_sessions = []
-        for session in sessions:
-            start = session.get("start_time")
-            if not start:
-                continue
-            try:
-                start_dt = datetime.fromisoformat(start)
-            except ValueError:
-                continue
-            if start_dt.date() == target_date:
-                filtered_sessions.append(session)
-        return filtered_sessions
-
-    def _render_headline_metrics(self, parent, sessions):
-        """Render the top-row headline metrics for today."""
-        planned = sum(s.get("initial_productivity_time", 0) for s in sessions)
-        actual = sum(s.get("actual_focus_time", 0) for s in sessions)
-        slack = sum(s.get("total_slack_time", 0) for s in sessions)
-        slack_ratio_total = (slack / (actual + slack)) if (actual + slack) else 0
-        efficiency = self._calculate_efficiency(slack_ratio_total)
+    def _render_headline_metrics(self, parent, rollup):
+        """Render the top-row headline metrics from a per-day rollup."""
+        summary = summarize_rollup(rollup)
 
         cards = [
-            ("Planned Focus", self._format_seconds(planned)),
-            ("Actual Focus", self._format_seconds(actual)),
-            ("Slack (Interruptions)", self._format_seconds(slack)),
-            ("Focus Efficiency", f"{efficiency * 100:.0f}%")
+            ("Planned Focus", self._format_seconds(summary["planned"])),
+            ("Actual Focus", self._format_seconds(summary["actual"])),
+            ("Slack (Interruptions)", self._format_seconds(summary["slack"])),
+            ("Focus Efficiency", f"{summary['efficiency'] * 100:.0f}%")
         ]
 
         for label, value in cards:
@@ -980,39 +1332,36 @@ class UIBuilder:
                 fg=self.get_t("text_light")
             ).pack()
 
-    def _render_insights(self, parent, sessions):
-        """Render behavioral insights for today."""
-        total_slack = sum(s.get("total_slack_time", 0) for s in sessions)
-        avg_slack = (total_slack / len(sessions)) if sessions else 0
+    def _render_insights(self, parent, sessions, rollup, most_disrupted=None):
+        """Render behavioral insights for today.
 
-        most_disrupted = None
-        max_ratio = -1
-        for session in sessions:
-            ratio = session.get("slack_ratio", 0)
-            if ratio > max_ratio:
-                max_ratio = ratio
-                most_disrupted = session
-
-        longest_interrupt = None
-        longest_duration = None
-        for session in sessions:
-            for seg in session.get("slack_segments", []):
-                duration = seg.get("duration_seconds")
-                if duration is None:
-                    continue
-                if longest_duration is None or duration > longest_duration:
-                    longest_duration = duration
-                    longest_interrupt = duration
+        most_disrupted, if given, is a precomputed (start_time, slack ratio) pair
+        used instead of scanning sessions (range mode).
+        """
+        summary = summarize_rollup(rollup)
+        if most_disrupted is None:
+            most_disrupted, max_ratio = find_most_disrupted(sessions)
+        else:
+            most_disrupted, max_ratio = most_disrupted
+        longest_interrupt = summary["longest_interruption"]
 
         items = [
-            ("Sessions", str(len(sessions))),
-            ("Avg Slack / Session", self._format_seconds(avg_slack)),
+            ("Sessions", str(summary["sessions"])),
+            ("Avg Slack / Session", self._format_seconds(summary["avg_slack"])),
             ("Most Disrupted", self._format_most_disrupted(most_disrupted, max_ratio)),
         ]
 
         if longest_interrupt is not None:
             items.insert(0, ("Longest Interruption", self._format_seconds(longest_interrupt)))
 
+        day_interruptions = summary["interruptions"]
+        if day_interruptions and day_interruptions["count"]:
+            items.append(("Interruption p50 / p90 / p99", self._format_quantiles(day_interruptions)))
+            items.append(("Interruption Mix", self._format_histogram(day_interruptions["histogram"])))
+        all_time = self.clock_app.stats_tracker.get_interruption_summary()
+        if all_time["count"]:
+            items.append(("All-Time p50 / p90 / p99", self._format_quantiles(all_time)))
+
         for label, value in items:
             card = tk.Frame(
                 parent,
@@ -1057,8 +1406,8 @@ class UIBuilder:
         table = tk.Frame(container, bg=self.get_t("frame_bg"))
         table.pack(fill=tk.BOTH, expand=True, padx=12, pady=(0, 12))
 
-        columns = ["Start", "Planned", "Slack", "Slack %", "Actual", "Efficiency", "Outcome"]
-        widths = [10, 12, 10, 9, 12, 11, 12]
+        columns = ["Start", "Project", "Planned", "Slack", "Slack %", "Actual", "Efficiency", "Outcome"]
+        widths = [10, 14, 12, 10, 9, 12, 11, 12]
 
         for idx, col in enumerate(columns):
             tk.Label(
@@ -1081,14 +1430,8 @@ class UIBuilder:
             ).grid(row=1, column=0, columnspan=len(columns), sticky="w")
             return
 
-        from datetime import datetime
         for row_idx, session in enumerate(sessions, start=1):
-            start_time = session.get("start_time")
-            try:
-                start_dt = datetime.fromisoformat(start_time) if start_time else None
-                start_label = start_dt.strftime("%H:%M") if start_dt else "--:--"
-            except ValueError:
-                start_label = "--:--"
+            start_label = session_clock_label(session)
 
             planned = self._format_seconds(session.get("initial_productivity_time", 0))
             slack = self._format_seconds(session.get("total_slack_time", 0))
@@ -1100,7 +1443,7 @@ class UIBuilder:
             raw_outcome = session.get("outcome", "unknown")
             outcome = raw_outcome.replace("_", " ").title()
 
-            values = [start_label, planned, slack, slack_label, actual, efficiency_label, outcome]
+            values = [start_label, session.get("project") or "-", planned, slack, slack_label, actual, efficiency_label, outcome]
 
             for col_idx, value in enumerate(values):
                 tk.Label(
@@ -1113,6 +1456,71 @@ class UIBuilder:
                     anchor=tk.W
                 ).grid(row=row_idx, column=col_idx, sticky="w")
 
+    def _render_period_table(self, parent, totals, period):
+        """Render per-day, per-week or per-month totals for a selected range."""
+        container = tk.Frame(parent, bg=self.get_t("frame_bg"), bd=2, relief=tk.RAISED)
+        container.pack(fill=tk.BOTH, expand=True)
+
+        titles = {"day": "Daily Totals", "week": "Weekly Totals", "month": "Monthly Totals"}
+        tk.Label(
+            container,
+            text=titles[period],
+            font=('Arial', 12, 'bold'),
+            bg=self.get_t("frame_bg"),
+            fg=self.get_t("text_dark")
+        ).pack(anchor=tk.W, padx=12, pady=(10, 6))
+
+        table = tk.Frame(container, bg=self.get_t("frame_bg"))
+        table.pack(fill=tk.BOTH, expand=True, padx=12, pady=(0, 12))
+
+        columns = ["Period", "Sessions", "Planned", "Actual", "Slack", "Efficiency", "Completed"]
+        widths = [16, 9, 12, 12, 10, 11, 10]
+
+        for idx, col in enumerate(columns):
+            tk.Label(
+                table,
+                text=col,
+                font=('Arial', 9, 'bold'),
+                bg=self.get_t("frame_bg"),
+                fg=self.get_t("text_muted"),
+                width=widths[idx],
+                anchor=tk.W
+            ).grid(row=0, column=idx, sticky="w", pady=(0, 6))
+
+        if not totals:
+            tk.Label(
+                table,
+                text="No sessions in this range.",
+                font=('Arial', 10),
+                bg=self.get_t("frame_bg"),
+                fg=self.get_t("text_dark")
+            ).grid(row=1, column=0, columnspan=len(columns), sticky="w")
+            return
+
+        label_formats = {"day": "%a %b %d", "week": "Wk of %b %d", "month": "%B %Y"}
+        for row_idx, (period_start, row) in enumerate(totals.items(), start=1):
+            busy = row["actual"] + row["slack"]
+            slack_ratio = (row["slack"] / busy) if busy else 0
+            values = [
+                period_start.strftime(label_formats[period]),
+                str(row["sessions"]),
+                self._format_seconds(row["planned"]),
+                self._format_seconds(row["actual"]),
+                self._format_seconds(row["slack"]),
+                f"{self._calculate_efficiency(slack_ratio) * 100:.0f}%",
+                str(row["completed"]),
+            ]
+            for col_idx, value in enumerate(values):
+                tk.Label(
+                    table,
+                    text=value,
+                    font=('Arial', 10),
+                    bg=self.get_t("frame_bg"),
+                    fg=self.get_t("text_dark"),
+                    width=widths[col_idx],
+                    anchor=tk.W
+                ).grid(row=row_idx, column=col_idx, sticky="w")
+
     def _format_signed_seconds(self, total_seconds):
         """Format seconds with a sign for overrun values."""
         sign = "-" if total_seconds < 0 else "+"
@@ -1122,19 +1530,34 @@ class UIBuilder:
         """Format the most disrupted session label."""
         if not session:
             return "--"
-        from datetime import datetime
+        if isinstance(session, str):
+            from datetime import datetime
 
-        start_time = session.get("start_time")
-        try:
-            start_dt = datetime.fromisoformat(start_time) if start_time else None
-            start_label = start_dt.strftime("%H:%M") if start_dt else "--:--"
-        except ValueError:
-            start_label = "--:--"
-        return f"{start_label} ({ratio * 100:.0f}%)"
+            # A start_time from a range query: include the date.
+            return f"{datetime.fromisoformat(session):%b %d %H:%M} ({ratio * 100:.0f}%)"
+        return f"{session_clock_label(session)} ({ratio * 100:.0f}%)"
+
+    def _format_quantiles(self, interruptions):
+        """Format an interruption summary's p50/p90/p99 as M:SS values."""
+        return " / ".join(
+            f"{interruptions[key] // 60}:{interruptions[key] % 60:02d}" for key in ("p50", "p90", "p99")
+        )
+
+    def _format_histogram(self, histogram):
+        """Format non-empty interruption histogram bins as "label count" pairs."""
+        return "  ".join(f"{label} {count}" for label, count in histogram.items() if count) or "--"
 
     def _calculate_efficiency(self, slack_ratio):
         """Compute focus efficiency from slack ratio."""
-        return max(0, 1 - slack_ratio)
+        return calculate_efficiency(slack_ratio)
+
+    def _format_streak(self, summary):
+        """Format goal progress and streaks, e.g. 'Goal 1h 10m / 2h 0m | Streak 3 days (best 7)'."""
+        days = "day" if summary["current"] == 1 else "days"
+        return (
+            f"Goal {self._format_seconds(summary['today_focus'])} / {self._format_seconds(summary['goal'])}"
+            f" | Streak {summary['current']} {days} (best {summary['best']})"
+        )
 
     def _format_seconds(self, total_seconds):
         """Format seconds to H:MM:SS."""
@@ -1144,23 +1567,15 @@ class UIBuilder:
         seconds = total_seconds % 60
         return f"{hours:d}:{minutes:02d}:{seconds:02d}"
 
-    def _render_calendar_grid(self, grid_frame, sessions, state, on_day_select=None):
+    def _render_calendar_grid(self, grid_frame, state, on_day_select=None):
         """Render just the calendar grid (for month changes)."""
         import calendar
         from datetime import datetime
 
-        # Build day -> session count mapping
-        day_sessions = {}
-        for session in sessions:
-            start_time = session.get("start_time")
-            if not start_time:
-                continue
-            try:
-                start_dt = datetime.fromisoformat(start_time)
-                day = start_dt.date()
-                day_sessions[day] = day_sessions.get(day, 0) + 1
-            except ValueError:
-                continue
+        # Day -> session count mapping for the displayed month
+        day_sessions = self.clock_app.stats_tracker.get_day_counts(
+            state['current_year'], state['current_month']
+        )
 
         # Weekday headers
         for col, day_name in enumerate(['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']):
@@ -1177,6 +1592,8 @@ class UIBuilder:
         # Calendar days
         cal_obj = calendar.monthcalendar(state['current_year'], state['current_month'])
         today = datetime.now().date()
+        range_start = state.get("range_start")
+        range_end = state.get("range_end") or range_start
 
         for week_num, week in enumerate(cal_obj):
             for day_num, day in enumerate(week):
@@ -1195,7 +1612,9 @@ class UIBuilder:
                     if day_date == today:
                         bg_color = self.get_t("button_active")
                         text_color = self.get_t("text_light")
-                    elif day_date == state.get("selected_date"):
+                    elif (range_start <= day_date <= range_end) if range_start else (
+                        not state.get("range_mode") and day_date == state.get("selected_date")
+                    ):
                         bg_color = self.get_t("warning_medium")
                         text_color = self.get_t("text_light")
                     elif sessions_count > 0: